@@ -68,15 +68,31 @@
 #     return {"total_records": len(preds),
 #             "predictions": preds.tolist()}
 
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, HTTPException, Query
+from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
+import numpy as np
 import pandas as pd
-import pickle
+import io
+import os
+import threading
+from src.components.data_transformation import CAT_TARGET_ENC_COLS, NUMERICAL_COLS
+from src.monitoring.input_drift import InputDriftMonitor
+from src.monitoring.traffic_capture import TrafficCapture
+from src.serving.scheduler import PriorityScheduler
+from src.serving.bulk_jobs import BulkJobQueue
+from src.pipelines.prediction_pipeline import predict_deduplicated, CustomDataBatch, normalize_model_key
+from src.serving.encoders import negotiate_format, encode_predictions, encode_json, UnsupportedFormat
+from src.pipelines.score_store import ScoreStore
+from src.serving.model_registry import ModelRegistry, UnknownModel
+from src.serving.warmup import Readiness
+from src.utils import load_object, load_json
+from src.logger import logging
 
 app = FastAPI(
     title="Failure Risk Prediction API",
@@ -98,14 +114,159 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 # ------------ Load Model + Preprocessor ----------------
-MODEL_PATH = "artifacts/random_forest_model.pkl"
-PREPROCESSOR_PATH = "artifacts/preprocessor.pkl"
+# Requests pick a pair with ?model_key= (artifacts/models/<key>/), loaded on first use.
+# The default pair is loaded at import so a prefork parent shares it with its workers.
+model_registry = ModelRegistry()
+default_artifacts = model_registry.get()
+model = default_artifacts.model
+preprocessor = default_artifacts.preprocessor
+
+
+def is_default_model(model_key):
+    return normalize_model_key(model_key) is None
+
+# ------------ Input Drift Sketches ----------------
+INPUT_SKETCH_BASELINE_PATH = "artifacts/input_sketch_baseline.pkl"
+
+drift_monitor = InputDriftMonitor.from_preprocessor(preprocessor, CAT_TARGET_ENC_COLS, NUMERICAL_COLS[0])
+drift_baseline = load_object(INPUT_SKETCH_BASELINE_PATH) if os.path.exists(INPUT_SKETCH_BASELINE_PATH) else None
+if drift_baseline is not None and not drift_baseline.compatible_with(drift_monitor):
+    logging.warning("Input sketch baseline predates the current sketch format; rerun data transformation")
+    drift_baseline = None
+
+# ------------ Priority Lanes ----------------
+# Interactive /predict calls and /predict_bulk scoring run on separate lanes
+scheduler = PriorityScheduler()
+
+
+# Multi-chunk requests resolve the LoadedModel once and pass it as `artifacts`, so an
+# eviction or re-promotion mid-request cannot mix two models (or their classes_)
+def score_frame(df, model_key=None, artifacts=None):
+    artifacts = artifacts or model_registry.get(model_key)
+    return artifacts.model.predict(artifacts.preprocessor.transform(df))
+
+
+def score_frame_proba(df, model_key=None, artifacts=None):
+    artifacts = artifacts or model_registry.get(model_key)
+    return artifacts.model.predict_proba(artifacts.preprocessor.transform(df))
+
+
+def score_bulk(records, with_probabilities=False, model_key=None):
+    # Runs on the bulk lane so building the frame does not block the event loop
+    artifacts = model_registry.get(model_key)
+    classes = artifacts.model.classes_
+    if not records:
+        # An empty batch is valid; return correctly shaped empty results instead of scoring
+        proba = np.zeros((0, len(classes)), dtype=np.float32) if with_probabilities else None
+        return np.array([], dtype=classes.dtype), proba, classes, {"rows": 0, "unique_rows": 0, "dedup_ratio": 1.0}
+    df = CustomDataBatch.from_records(records).to_frame()
+    if is_default_model(model_key):
+        drift_monitor.update_frame(df)
+    score_fn = score_frame_proba if with_probabilities else score_frame
+    scores, metadata = predict_deduplicated(
+        lambda unique: scheduler.map_chunks("bulk", lambda chunk: score_fn(chunk, artifacts=artifacts), unique), df
+    )
+    if with_probabilities:
+        # Same labels model.predict would return, without a second pass over the forest
+        return classes[scores.argmax(axis=1)], scores, classes, metadata
+    return scores, None, classes, metadata
+
+
+# One reusable single-row buffer per lane thread for /predict
+_single_row = threading.local()
+
+
+def score_record(record, model_key=None):
+    # Runs on the interactive lane, so the drift lock is never taken on the event loop
+    if is_default_model(model_key):
+        drift_monitor.update(record)
+    batch = getattr(_single_row, "batch", None)
+    if batch is None:
+        batch = _single_row.batch = CustomDataBatch(capacity=1)
+    batch.reset()
+    batch.append(record)
+    return score_frame(batch.to_frame(), model_key)[0]
+
+
+# ------------ Bulk Jobs ----------------
+def score_job_chunk(df, model_key=None):
+    # Job chunks share the bulk lane with /predict_bulk
+    artifacts = model_registry.get(model_key)
+    score_fn = lambda chunk: score_frame(chunk, artifacts=artifacts)
+    unique_scorer = lambda unique: scheduler.submit("bulk", scheduler.map_chunks, "bulk", score_fn, unique).result()
+    return predict_deduplicated(unique_scorer, df)[0]
+
+
+bulk_jobs = BulkJobQueue(
+    score_job_chunk,
+    required_columns=NUMERICAL_COLS + CAT_TARGET_ENC_COLS,
+    version_fn=lambda model_key: model_registry.get(model_key).version,
+)
+
+
+@app.on_event("startup")
+def start_bulk_jobs():
+    # Worker threads start per serving process, resuming jobs left on disk
+    bulk_jobs.start()
+
+
+@app.on_event("shutdown")
+def stop_bulk_jobs():
+    bulk_jobs.stop()
+
+
+# ------------ Traffic Capture ----------------
+# Opt-in with CAPTURE_SAMPLE_RATE; replay with `python -m src.monitoring.replay logs/traffic`
+traffic_capture = TrafficCapture()
+
+
+async def capture_request(request: Request):
+    if traffic_capture.should_sample():
+        # FastAPI has already read the body, so this returns the cached bytes
+        body = await request.body()
+        traffic_capture.capture(
+            request.method, request.url.path, request.url.query, request.headers.get("content-type"), body
+        )
+
+
+@app.on_event("startup")
+def start_traffic_capture():
+    traffic_capture.start()
+
+
+@app.on_event("shutdown")
+def stop_traffic_capture():
+    traffic_capture.stop()
 
-with open(MODEL_PATH, "rb") as f:
-    model = pickle.load(f)
 
-with open(PREPROCESSOR_PATH, "rb") as f:
-    preprocessor = pickle.load(f)
+# ------------ Readiness ----------------
+MODEL_VERSION_PATH = "artifacts/model_version.json"
+
+readiness = Readiness(
+    artifact_load_seconds=default_artifacts.load_seconds,
+    model_version={
+        "content_hash": default_artifacts.version,
+        # Written by every training run: <timestamp>-full or <timestamp>-incremental
+        "label": load_json(MODEL_VERSION_PATH)["version"] if os.path.exists(MODEL_VERSION_PATH) else None,
+    },
+)
+
+
+def score_warm_up_frame(df):
+    # Small batches warm the interactive lane threads, larger ones the bulk lane
+    lane = "interactive" if len(df) <= 8 else "bulk"
+    return scheduler.submit(lane, score_frame, df).result()
+
+
+@app.on_event("startup")
+def start_warm_up():
+    readiness.start(score_warm_up_frame, preprocessor)
+
+
+# ------------ Cohort Score Store ----------------
+# Built offline with `python -m src.pipelines.score_store cohort.csv`
+score_store = ScoreStore()
+
 
 # ------------ Schemas ----------------
 class InputData(BaseModel):
@@ -139,12 +300,22 @@ def health():
     return {"message": "Prediction API Running Successfully 🚀"}
 
 
+# ------------ Readiness ----------------
+@app.get("/ready")
+def ready():
+    """200 once this worker has warmed up, 503 before; the body carries load and warm-up telemetry."""
+    snapshot = readiness.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+
 # ------------ Single Prediction ----------------
 @app.post("/predict")
-def predict(data: InputData):
-    df = pd.DataFrame([data.dict()])
-    processed = preprocessor.transform(df)
-    prediction = model.predict(processed)[0]
+async def predict(data: InputData, request: Request, model_key: Optional[str] = None):
+    await capture_request(request)
+    try:
+        prediction = await scheduler.run("interactive", score_record, data.dict(), model_key)
+    except UnknownModel as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
     return {
     "status": "success",
@@ -155,12 +326,188 @@ def predict(data: InputData):
 
 # ------------ Bulk Prediction ----------------
 @app.post("/predict_bulk")
-def predict_bulk(batch: BatchInput):
+async def predict_bulk(
+    batch: BatchInput,
+    request: Request,
+    response_format: Optional[str] = Query(None, alias="format"),
+    probabilities: bool = False,
+    model_key: Optional[str] = None
+):
+    """Response format follows ?format=json|arrow|numpy or the Accept header."""
+    await capture_request(request)
+    try:
+        fmt = negotiate_format(request.headers.get("accept"), response_format)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+    try:
+        preds, proba, classes, metadata = await scheduler.run(
+            "bulk", score_bulk, batch.records, probabilities, model_key
+        )
+    except UnknownModel as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    try:
+        return encode_predictions(fmt, preds, classes, proba, metadata)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+
+# ------------ Chunked CSV Upload ----------------
+# The web UI sends a large CSV as a sequence of small CSV chunks, each repeating the header
+# row, and shows every chunk's predictions as they stream back. One chunk is held at a time.
+CSV_CHUNK_MAX_BYTES = int(os.getenv("CSV_CHUNK_MAX_BYTES", str(4 * 1024 * 1024)))
+CSV_STREAM_BLOCK_ROWS = 1000
+
+
+def read_csv_chunk(body):
+    df = pd.read_csv(io.BytesIO(body))
+    missing = [col for col in NUMERICAL_COLS + CAT_TARGET_ENC_COLS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+    return df
+
+
+def score_csv_block(df, artifacts):
+    if is_default_model(artifacts.key):
+        drift_monitor.update_frame(df)
+    return predict_deduplicated(
+        lambda unique: scheduler.map_chunks("bulk", lambda chunk: score_frame(chunk, artifacts=artifacts), unique), df
+    )[0]
+
+
+@app.post("/predict_csv")
+async def predict_csv(request: Request, offset: int = 0, model_key: Optional[str] = None):
+    """
+    Scores one CSV chunk and streams NDJSON: one {"offset", "predictions", "ids"}
+    line per block of rows, then {"done": true, "rows"}. offset is the row number
+    of the chunk's first row in the whole file; ids come from the student id
+    column when present.
+    """
+    try:
+        # Every block of this chunk is scored by the same loaded model
+        artifacts = await run_in_threadpool(model_registry.get, model_key)
+    except UnknownModel as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    body = bytearray()
+    async for block in request.stream():
+        body.extend(block)
+        if len(body) > CSV_CHUNK_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"CSV chunks are limited to {CSV_CHUNK_MAX_BYTES} bytes")
+
+    try:
+        df = await scheduler.run("bulk", read_csv_chunk, bytes(body))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    id_column = score_store.config.id_column
+
+    async def stream():
+        try:
+            for start in range(0, len(df), CSV_STREAM_BLOCK_ROWS):
+                block = df.iloc[start:start + CSV_STREAM_BLOCK_ROWS]
+                preds = await scheduler.run("bulk", score_csv_block, block, artifacts)
+                yield encode_json({
+                    "offset": offset + start,
+                    "predictions": [str(pred) for pred in preds.tolist()],
+                    "ids": block[id_column].astype(str).tolist() if id_column in block.columns else None,
+                }) + b"\n"
+            yield encode_json({"done": True, "offset": offset, "rows": len(df)}) + b"\n"
+        except Exception as e:
+            # Headers are already sent, so errors are reported in-band
+            yield encode_json({"error": str(e), "offset": offset}) + b"\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+# ------------ Lane Metrics ----------------
+@app.get("/metrics/lanes")
+def lane_metrics():
+    return scheduler.snapshot()
+
+
+# ------------ Model Registry Metrics ----------------
+@app.get("/metrics/models")
+def model_metrics():
+    return model_registry.metrics()
+
+
+# ------------ Input Drift ----------------
+@app.get("/drift")
+def drift():
+    if drift_baseline is None:
+        return {"status": "no_baseline", "rows": drift_monitor.rows}
+    return drift_monitor.compare(drift_baseline)
+
+
+@app.get("/drift/sketch")
+def drift_sketch():
+    # Raw sketch state of this worker; merge several with src.monitoring.input_drift.merge_monitors
+    return drift_monitor.to_dict()
+
+
+# ------------ Bulk Scoring Jobs ----------------
+@app.post("/jobs")
+async def submit_job(request: Request, model_key: Optional[str] = None):
+    """Accepts a CSV body (streamed to disk) and returns the job id."""
+    if not model_registry.exists(model_key):
+        raise HTTPException(status_code=404, detail=f"No artifacts for model key '{model_key}'")
+    # Resolving the model version may unpickle it, so it runs on the threadpool
+    job_id, input_path = await run_in_threadpool(bulk_jobs.create_job, model_key)
+    try:
+        # Rows are counted while the body streams in, so enqueueing never re-reads the file
+        newlines, last_byte = 0, b"\n"
+        with open(input_path, "wb") as f:
+            async for block in request.stream():
+                f.write(block)
+                if block:
+                    newlines += block.count(b"\n")
+                    last_byte = block[-1:]
+        total_rows = max(newlines + (last_byte != b"\n") - 1, 0)
+        status = await run_in_threadpool(bulk_jobs.enqueue, job_id, total_rows)
+    except Exception as e:
+        bulk_jobs.delete(job_id)
+        raise HTTPException(status_code=400, detail=str(e))
+    return status
+
+
+@app.post("/jobs/records")
+def submit_job_records(batch: BatchInput, model_key: Optional[str] = None):
+    # Plain def: FastAPI runs it in its threadpool, so building and writing the CSV stays off the event loop
+    if not batch.records:
+        raise HTTPException(status_code=400, detail="A job needs at least one record")
+    if not model_registry.exists(model_key):
+        raise HTTPException(status_code=404, detail=f"No artifacts for model key '{model_key}'")
     df = pd.DataFrame([row.dict() for row in batch.records])
-    processed = preprocessor.transform(df)
-    preds = model.predict(processed)
-
-    return {
-        "total_records": len(preds),
-        "predictions": preds.tolist()
-    }
+    return bulk_jobs.submit_frame(df, model_key)
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    status = bulk_jobs.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return status
+
+
+@app.get("/jobs/{job_id}/results")
+def job_results(job_id: str):
+    status = bulk_jobs.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    if status["state"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {status['state']}")
+    return StreamingResponse(
+        bulk_jobs.iter_results(job_id),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={job_id}.csv"}
+    )
+
+
+# ------------ Precomputed Cohort Scores ----------------
+@app.get("/scores/{student_id}")
+def lookup_score(student_id: str):
+    result = score_store.lookup(student_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Student not found in the score store")
+    return result
@@ -0,0 +1,40 @@
+"""
+Bulk scoring with and without row deduplication on skewed synthetic cohorts.
+
+    python -m benchmarks.bench_bulk_dedup
+"""
+
+import time
+import numpy as np
+from benchmarks.synthetic import make_cohort, load_or_fit_artifacts
+from src.pipelines.prediction_pipeline import predict_deduplicated
+
+
+def _best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run(row_counts=(10_000, 100_000), skews=(0.8, 1.2, 1.6), repeats=3):
+    preprocessor, model = load_or_fit_artifacts()
+
+    def score(df):
+        return model.predict(preprocessor.transform(df))
+
+    print(f"{'rows':>8} {'skew':>5} {'unique':>8} {'ratio':>7} {'plain s':>9} {'dedup s':>9} {'speedup':>8}")
+    for n_rows in row_counts:
+        for skew in skews:
+            cohort = make_cohort(n_rows, skew=skew)
+            plain_s, plain = _best_of(lambda: score(cohort), repeats)
+            dedup_s, (dedup, metadata) = _best_of(lambda: predict_deduplicated(score, cohort), repeats)
+            assert np.array_equal(plain, dedup), "deduplicated predictions differ from plain scoring"
+            print(f"{n_rows:>8} {skew:>5} {metadata['unique_rows']:>8} {metadata['dedup_ratio']:>7.2f} "
+                  f"{plain_s:>9.3f} {dedup_s:>9.3f} {plain_s / dedup_s:>7.2f}x")
+
+
+if __name__ == "__main__":
+    run()
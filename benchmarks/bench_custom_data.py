@@ -0,0 +1,72 @@
+"""
+Per-record memory and latency of CustomData and CustomDataBatch against the
+previous dict-backed record with one DataFrame per record.
+
+    python -m benchmarks.bench_custom_data
+"""
+
+import time
+import tracemalloc
+import pandas as pd
+from benchmarks.synthetic import make_cohort, load_or_fit_artifacts
+from src.pipelines.prediction_pipeline import CustomData, CustomDataBatch, CUSTOM_DATA_FIELDS
+
+
+class DictCustomData:
+    """The previous CustomData layout: attributes in an instance __dict__."""
+
+    def __init__(self, **values):
+        for field in CUSTOM_DATA_FIELDS:
+            setattr(self, field, values.get(field))
+
+    def get_data_as_dataframe(self):
+        return pd.DataFrame({field: [getattr(self, field)] for field in CUSTOM_DATA_FIELDS})
+
+
+def _allocated_bytes_per_record(factory, rows):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    records = [factory(**row) for row in rows]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del records
+    return allocated / len(rows)
+
+
+def run(n_records=20_000):
+    preprocessor, model = load_or_fit_artifacts()
+    rows = make_cohort(n_records).to_dict("records")
+
+    print(f"Per-record allocation ({n_records} records)")
+    print(f"  dict-backed record : {_allocated_bytes_per_record(DictCustomData, rows):8.1f} B")
+    print(f"  slotted CustomData : {_allocated_bytes_per_record(CustomData, rows):8.1f} B")
+
+    records = [CustomData(**row) for row in rows]
+    old_records = [DictCustomData(**row) for row in rows]
+
+    start = time.perf_counter()
+    frames = [record.get_data_as_dataframe() for record in old_records]
+    model.predict(preprocessor.transform(pd.concat(frames, ignore_index=True)))
+    per_record_s = time.perf_counter() - start
+
+    batch = CustomDataBatch(capacity=n_records)
+    start = time.perf_counter()
+    batch.extend(records)
+    model.predict(preprocessor.transform(batch.to_frame()))
+    batch_s = time.perf_counter() - start
+
+    batch.reset()
+    start = time.perf_counter()
+    batch.extend(records)
+    model.predict(preprocessor.transform(batch.to_frame()))
+    reused_s = time.perf_counter() - start
+
+    print(f"Build + score latency per record")
+    print(f"  DataFrame per record : {per_record_s / n_records * 1e6:8.1f} us")
+    print(f"  CustomDataBatch      : {batch_s / n_records * 1e6:8.1f} us")
+    print(f"  reused buffers       : {reused_s / n_records * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    run()
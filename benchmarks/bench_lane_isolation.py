@@ -0,0 +1,80 @@
+"""
+Interactive /predict latency with and without concurrent /predict_bulk load.
+
+    uvicorn app:app --port 8000
+    python -m benchmarks.bench_lane_isolation --target http://127.0.0.1:8000
+
+Exits non-zero when the interactive p99 under bulk load exceeds the idle
+p99 by more than --tolerance, i.e. when bulk work leaks into the
+interactive lane or the event loop.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.request
+import numpy as np
+from benchmarks.synthetic import make_cohort
+
+
+def _post(url, body, timeout=120):
+    request = urllib.request.Request(url, data=body, method="POST", headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+
+
+def _interactive_latencies(target, records, n_requests):
+    latencies_ms = []
+    for i in range(n_requests):
+        body = json.dumps(records[i % len(records)]).encode("utf-8")
+        start = time.perf_counter()
+        _post(f"{target}/predict", body)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies_ms)
+
+
+def _bulk_load(target, body, stop):
+    while not stop.is_set():
+        _post(f"{target}/predict_bulk", body)
+
+
+def run(target, n_requests=300, bulk_rows=20_000, bulk_clients=2, tolerance=1.5):
+    target = target.rstrip("/")
+    cohort = make_cohort(bulk_rows, skew=0.8, seed=1)
+    records = make_cohort(200, seed=2).to_dict(orient="records")
+    bulk_body = json.dumps({"records": cohort.to_dict(orient="records")}).encode("utf-8")
+
+    _interactive_latencies(target, records, 20)   # warm the interactive path
+    idle = _interactive_latencies(target, records, n_requests)
+
+    stop = threading.Event()
+    loaders = [threading.Thread(target=_bulk_load, args=(target, bulk_body, stop), daemon=True)
+               for _ in range(bulk_clients)]
+    for loader in loaders:
+        loader.start()
+    time.sleep(1.0)   # let the bulk lane fill up
+    try:
+        loaded = _interactive_latencies(target, records, n_requests)
+    finally:
+        stop.set()
+
+    print(f"{'':>12} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, latencies in (("idle", idle), ("bulk load", loaded)):
+        print(f"{name:>12} {np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 99):>8.2f}")
+
+    ratio = np.percentile(loaded, 99) / np.percentile(idle, 99)
+    print(f"p99 ratio under {bulk_clients} x {bulk_rows}-row bulk clients: {ratio:.2f} (tolerance {tolerance})")
+    return ratio <= tolerance
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check interactive p99 stays flat under bulk load")
+    parser.add_argument("--target", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--bulk-rows", type=int, default=20_000)
+    parser.add_argument("--bulk-clients", type=int, default=2)
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.target, args.requests, args.bulk_rows, args.bulk_clients, args.tolerance) else 1)
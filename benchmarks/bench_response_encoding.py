@@ -0,0 +1,54 @@
+"""
+Serialization time and payload size of the /predict_bulk response formats.
+
+    python -m benchmarks.bench_response_encoding
+"""
+
+import json
+import time
+import numpy as np
+from benchmarks.synthetic import LABELS
+from src.serving import encoders
+
+
+def _best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run(row_counts=(10_000, 100_000, 1_000_000), repeats=5):
+    rng = np.random.default_rng(0)
+    classes = np.array(sorted(LABELS), dtype=object)
+
+    print(f"{'rows':>9} {'format':<22} {'ms':>9} {'KB':>10}")
+    for n_rows in row_counts:
+        probabilities = rng.dirichlet(np.ones(len(classes)), size=n_rows)
+        predictions = classes[probabilities.argmax(axis=1)]
+
+        cases = {
+            "baseline json": lambda with_proba: json.dumps({
+                "total_records": n_rows,
+                "predictions": predictions.tolist(),
+                **({"probabilities": probabilities.tolist()} if with_proba else {}),
+            }).encode("utf-8"),
+        }
+        for fmt in encoders.FORMATS:
+            if fmt == "arrow" and encoders.pa is None:
+                continue
+            cases[fmt] = lambda with_proba, fmt=fmt: encoders.encode_predictions(
+                fmt, predictions, classes, probabilities if with_proba else None
+            ).body
+
+        for with_proba in (False, True):
+            for name, encode in cases.items():
+                seconds, body = _best_of(lambda: encode(with_proba), repeats)
+                label = f"{name}{' +proba' if with_proba else ''}"
+                print(f"{n_rows:>9} {label:<22} {seconds * 1000:>9.2f} {len(body) / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    run()
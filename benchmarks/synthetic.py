@@ -0,0 +1,58 @@
+"""Synthetic cohort data and artifacts shared by the benchmark scripts."""
+
+import os
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from src.components.data_transformation import DataTransformation, TARGET_COLUMN
+from src.utils import load_object
+
+CATEGORIES = {
+    "Gender": ["Male", "Female"],
+    "City": [f"City_{i}" for i in range(60)],
+    "Highest_Qualification": ["BTech", "MTech", "BSc", "MSc", "BCA", "MCA", "MBA", "Diploma"],
+    "Stream": ["CSE", "ECE", "IT", "ME", "CE", "EE", "Maths", "Commerce"],
+    "Year_Of_Completion": list(range(2012, 2025)),
+    "Are_you_currently_working": ["Yes", "No"],
+    "Your_Designation": [f"Designation_{i}" for i in range(40)],
+    "Employment_Type": ["Full Time", "Part Time", "Intern", "Contract"],
+}
+LABELS = ["Suitable", "MidSenior_Not_Suitable", "Senior_Not_Suitable"]
+
+
+def _zipf_choice(rng, values, n_rows, skew):
+    # Zipf-like weights: a handful of values carry most of the rows, as in real cohort exports
+    weights = 1.0 / np.arange(1, len(values) + 1) ** skew
+    weights /= weights.sum()
+    return rng.choice(np.array(values, dtype=object), size=n_rows, p=weights)
+
+
+def make_cohort(n_rows: int, skew: float = 1.2, seed: int = 0, with_target: bool = False) -> pd.DataFrame:
+    """Synthetic cohort export; higher skew means more rows identical on the model features."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({col: _zipf_choice(rng, values, n_rows, skew) for col, values in CATEGORIES.items()})
+    df["Year_Of_Completion"] = df["Year_Of_Completion"].astype(int)
+    df["Age"] = _zipf_choice(rng, list(range(22, 45)), n_rows, skew).astype(float)
+    df["First_Name"] = rng.choice([f"First_{i}" for i in range(500)], size=n_rows)
+    df["Last_Name"] = rng.choice([f"Last_{i}" for i in range(500)], size=n_rows)
+    df["Company_Name"] = rng.choice([f"Company_{i}" for i in range(200)], size=n_rows)
+    if with_target:
+        score = (df["Age"] > 30).astype(int) + (df["Are_you_currently_working"] == "Yes").astype(int)
+        df[TARGET_COLUMN] = np.array(LABELS, dtype=object)[score.to_numpy()]
+    return df
+
+
+def load_or_fit_artifacts(artifacts_dir: str = "artifacts"):
+    """Returns (preprocessor, model): the trained artifacts if present, else ones fitted on synthetic data."""
+    preprocessor_path = os.path.join(artifacts_dir, "preprocessor.pkl")
+    model_path = os.path.join(artifacts_dir, "random_forest_model.pkl")
+    if os.path.exists(preprocessor_path) and os.path.exists(model_path):
+        return load_object(preprocessor_path), load_object(model_path)
+
+    train_df = make_cohort(5000, seed=42, with_target=True)
+    X = train_df.drop(columns=[TARGET_COLUMN])
+    y = train_df[TARGET_COLUMN]
+    preprocessor = DataTransformation().get_data_transformation_object()
+    model = RandomForestClassifier(n_estimators=300, random_state=42, class_weight="balanced")
+    model.fit(preprocessor.fit_transform(X, y), y)
+    return preprocessor, model
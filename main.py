@@ -1,12 +1,41 @@
 from src.components.data_ingestion import DataIngestion
 from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
+from src.components.incremental_trainer import IncrementalTrainer, IncrementalTrainerConfig
 from src.logger import logging
 from src.exception import CustomException
+import argparse
 import sys
+import pandas as pd
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Failure risk training pipeline")
+    parser.add_argument("--incremental", metavar="CSV",
+                        help="update the current model from newly arrived records instead of a full retrain")
+    parser.add_argument("--new-trees", type=int, default=IncrementalTrainerConfig.new_trees)
+    parser.add_argument("--max-trees", type=int, default=IncrementalTrainerConfig.max_trees)
+    parser.add_argument("--compare-full-retrain", action="store_true",
+                        help="also run a full retrain and report drift against it")
+    args = parser.parse_args()
+
+    if args.incremental:
+        logging.info("====== Incremental Training Started ======")
+        try:
+            trainer = IncrementalTrainer(IncrementalTrainerConfig(
+                new_trees=args.new_trees,
+                max_trees=args.max_trees,
+                compare_full_retrain=args.compare_full_retrain
+            ))
+            version_dir, metadata = trainer.initiate_incremental_training(args.incremental)
+            print(f"New model version: {version_dir}")
+            print(f"Drift report: {metadata['drift']}")
+            logging.info("====== Incremental Training Successful ======")
+        except Exception as e:
+            logging.error("Incremental Training Failed")
+            raise CustomException(e, sys)
+        sys.exit(0)
+
     logging.info("====== Machine Learning Pipeline Started ======")
 
     try:
@@ -16,14 +45,16 @@ if __name__ == "__main__":
 
         # 2️⃣ Data Transformation
         transform_obj = DataTransformation()
-        train_arr, test_arr, _ = transform_obj.initiate_data_transformation(
+        train_arr, test_arr, preprocessor_path = transform_obj.initiate_data_transformation(
             train_path=train_data_path, 
             test_path=test_data_path
         )
 
         # 3️⃣ Model Training
         model_trainer = ModelTrainer()
-        model_trainer.initiate_model_training(train_arr, test_arr)
+        model_trainer.initiate_model_training(
+            train_arr, test_arr, preprocessor_path, pd.read_csv(test_data_path)
+        )
 
         logging.info("====== Pipeline Execution Successful ======")
 
@@ -10,11 +10,120 @@ from src.logger import logging
 import os
 from src.utils import save_object
 from category_encoders import TargetEncoder
+from src.monitoring.input_drift import InputDriftMonitor
+
+
+NUMERICAL_COLS = ["Age"]
+
+CAT_TARGET_ENC_COLS = [
+    "Gender",
+    "City",
+    "Highest_Qualification",
+    "Stream",
+    "Year_Of_Completion",
+    "Are_you_currently_working",
+    "Your_Designation",
+    "Employment_Type"
+]
+
+TARGET_COLUMN = "Suitability_Label"
 
 
 @dataclass
 class DataTransformationConfig:
     preprocessor_obj_file_path = os.path.join("artifacts", "preprocessor.pkl")
+    target_encoding_stats_file_path = os.path.join("artifacts", "target_encoding_stats.pkl")
+    input_sketch_baseline_file_path = os.path.join("artifacts", "input_sketch_baseline.pkl")
+
+
+class TargetEncodingStats:
+    """
+    Sufficient statistics (per-category row count and target sum) behind the
+    fitted TargetEncoder. Keeping them next to the preprocessor lets the
+    encoding be refreshed from newly arrived rows without refitting on the
+    full history.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.counts = {col: {} for col in self.columns}
+        self.sums = {col: {} for col in self.columns}
+        self.total_count = 0
+        self.total_sum = 0.0
+        self.classes_ = None
+
+    def _target_as_float(self, y):
+        y = pd.Series(y).reset_index(drop=True)
+        try:
+            return y.astype(float).to_numpy()
+        except (TypeError, ValueError):
+            # String labels are scored by their sorted class index (LabelEncoder order)
+            if self.classes_ is None:
+                self.classes_ = sorted(y.unique())
+            for label in y.unique():
+                if label not in self.classes_:
+                    self.classes_.append(label)
+            lookup = {label: idx for idx, label in enumerate(self.classes_)}
+            return y.map(lookup).astype(float).to_numpy()
+
+    def update(self, X_imputed, y):
+        """
+        Adds rows to the statistics.
+
+        Args:
+            X_imputed: array of the target-encoded columns after the fitted imputer
+            y: target values aligned with X_imputed
+
+        Returns:
+            self
+        """
+        X_imputed = np.asarray(X_imputed, dtype=object)
+        y_num = self._target_as_float(y)
+
+        for pos, col in enumerate(self.columns):
+            grouped = pd.Series(y_num).groupby(pd.Series(X_imputed[:, pos])).agg(["count", "sum"])
+            counts = self.counts[col]
+            sums = self.sums[col]
+            for category, count, total in zip(grouped.index, grouped["count"], grouped["sum"]):
+                counts[category] = counts.get(category, 0) + int(count)
+                sums[category] = sums.get(category, 0.0) + float(total)
+
+        self.total_count += len(y_num)
+        self.total_sum += float(y_num.sum())
+        return self
+
+    def apply_to(self, target_encoder):
+        """
+        Rewrites the mapping of a fitted category_encoders TargetEncoder from
+        the current statistics, registering categories it has not seen yet.
+        """
+        prior = self.total_sum / self.total_count
+        unknown_value = prior if target_encoder.handle_unknown == "value" else np.nan
+        missing_value = prior if target_encoder.handle_missing == "value" else np.nan
+        ordinal_mapping = {entry["col"]: entry for entry in target_encoder.ordinal_encoder.mapping}
+
+        for enc_col, col in zip(target_encoder.cols, self.columns):
+            entry = ordinal_mapping[enc_col]
+            codes = entry["mapping"]
+
+            unseen = [category for category in self.counts[col] if category not in codes.index]
+            if unseen:
+                start = int(codes.max()) + 1
+                codes = pd.concat([codes, pd.Series(range(start, start + len(unseen)), index=unseen)])
+                entry["mapping"] = codes
+
+            counts = pd.Series(self.counts[col], dtype=float)
+            means = pd.Series(self.sums[col], dtype=float) / counts
+            smoove = 1 / (1 + np.exp(-(counts - target_encoder.min_samples_leaf) / target_encoder.smoothing))
+            smoothed = prior * (1 - smoove) + means * smoove
+            smoothed.index = codes.reindex(smoothed.index).astype(int).values
+
+            smoothed.loc[-1] = unknown_value
+            smoothed.loc[-2] = missing_value
+            target_encoder.mapping[enc_col] = smoothed
+
+        target_encoder._mean = prior
+        return target_encoder
 
 
 class DataTransformation:
@@ -26,18 +135,8 @@ class DataTransformation:
             logging.info("Data Transformation initiated for Suitability Dataset")
 
             # ------------------ Columns ------------------
-            numerical_cols = ["Age"]
-
-            cat_target_enc_cols = [
-                "Gender",
-                "City",
-                "Highest_Qualification",
-                "Stream",
-                "Year_Of_Completion",
-                "Are_you_currently_working",
-                "Your_Designation",
-                "Employment_Type"
-            ]
+            numerical_cols = NUMERICAL_COLS
+            cat_target_enc_cols = CAT_TARGET_ENC_COLS
 
             logging.info("Creating Encoding Pipelines")
 
@@ -80,7 +179,7 @@ class DataTransformation:
 
             preprocessing_obj = self.get_data_transformation_object()
 
-            target_column_name = "Suitability_Label"
+            target_column_name = TARGET_COLUMN
 
             input_feature_train_df = train_df.drop(columns=[target_column_name], axis=1)
             target_feature_train_df = train_df[target_column_name]
@@ -108,6 +207,33 @@ class DataTransformation:
 
             logging.info("Preprocessor Saved Successfully")
 
+            # Keep the target-encoding statistics so incremental retrains can update them
+            imputer = preprocessing_obj.named_transformers_["target_enc"].named_steps["imputer"]
+            target_encoding_stats = TargetEncodingStats(CAT_TARGET_ENC_COLS).update(
+                imputer.transform(input_feature_train_df[CAT_TARGET_ENC_COLS]),
+                target_feature_train_df
+            )
+
+            save_object(
+                file_path=self.data_transformation_config.target_encoding_stats_file_path,
+                obj=target_encoding_stats
+            )
+
+            logging.info("Target Encoding Statistics Saved Successfully")
+
+            # Training-time input sketches, the reference for serving-side drift monitoring
+            input_sketch_baseline = InputDriftMonitor.from_preprocessor(
+                preprocessing_obj, CAT_TARGET_ENC_COLS, NUMERICAL_COLS[0]
+            )
+            input_sketch_baseline.update_frame(input_feature_train_df)
+
+            save_object(
+                file_path=self.data_transformation_config.input_sketch_baseline_file_path,
+                obj=input_sketch_baseline
+            )
+
+            logging.info("Input Sketch Baseline Saved Successfully")
+
             return (
                 train_arr,
                 test_arr,
@@ -0,0 +1,241 @@
+import os
+import sys
+import time
+from datetime import datetime
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import save_object, load_object, save_json
+from src.components.data_transformation import (
+    DataTransformation,
+    TargetEncodingStats,
+    CAT_TARGET_ENC_COLS,
+    TARGET_COLUMN,
+)
+
+
+@dataclass
+class IncrementalTrainerConfig:
+    preprocessor_file_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    trained_model_file_path: str = os.path.join("artifacts", "random_forest_model.pkl")
+    target_encoding_stats_file_path: str = os.path.join("artifacts", "target_encoding_stats.pkl")
+    train_data_path: str = os.path.join("artifacts", "train.csv")
+    test_data_path: str = os.path.join("artifacts", "test.csv")
+    versions_dir: str = os.path.join("artifacts", "versions")
+    model_version_file_path: str = os.path.join("artifacts", "model_version.json")
+    new_trees: int = 50              # trees added per incremental run
+    max_trees: int = 400             # forest cap, oldest trees are evicted beyond it
+    replay_fraction: float = 0.1     # share of the historical train set mixed into the new rows
+    promote: bool = True             # overwrite the serving artifacts with the new version
+    compare_full_retrain: bool = False
+
+
+def compare_models(reference, candidate, X, y=None):
+    """
+    Measures how far a candidate model has drifted from a reference model.
+
+    Args:
+        reference: (preprocessor, model) pair used as the baseline
+        candidate: (preprocessor, model) pair being compared
+        X: raw feature DataFrame to score with both pairs
+        y: optional true labels, adds accuracy of both models
+
+    Returns:
+        dict with prediction agreement, mean total-variation distance between
+        predicted class probabilities and the predicted class share of each model
+    """
+    ref_pre, ref_model = reference
+    cand_pre, cand_model = candidate
+
+    ref_X = ref_pre.transform(X)
+    cand_X = cand_pre.transform(X)
+    ref_pred = ref_model.predict(ref_X)
+    cand_pred = cand_model.predict(cand_X)
+
+    classes = sorted(set(ref_model.classes_) | set(cand_model.classes_), key=str)
+    ref_prob = pd.DataFrame(ref_model.predict_proba(ref_X), columns=ref_model.classes_).reindex(columns=classes, fill_value=0.0)
+    cand_prob = pd.DataFrame(cand_model.predict_proba(cand_X), columns=cand_model.classes_).reindex(columns=classes, fill_value=0.0)
+
+    drift = {
+        "rows": int(len(X)),
+        "prediction_agreement": float(np.mean(ref_pred == cand_pred)),
+        "mean_probability_tvd": float(0.5 * np.abs(ref_prob.values - cand_prob.values).sum(axis=1).mean()),
+        "reference_class_share": pd.Series(ref_pred).value_counts(normalize=True).reindex(classes, fill_value=0.0).to_dict(),
+        "candidate_class_share": pd.Series(cand_pred).value_counts(normalize=True).reindex(classes, fill_value=0.0).to_dict(),
+    }
+
+    if y is not None:
+        drift["reference_accuracy"] = float(accuracy_score(y, ref_pred))
+        drift["candidate_accuracy"] = float(accuracy_score(y, cand_pred))
+
+    return drift
+
+
+class IncrementalTrainer:
+    """
+    Updates the served preprocessor and forest from newly arrived records
+    instead of refitting both from the raw CSV.
+
+    The TargetEncoder mapping is refreshed from accumulated per-category
+    statistics and new trees are grown on the recent rows with sklearn's
+    warm start. Old trees keep seeing the refreshed encoding, which is the
+    price of not refitting them; the drift report makes that visible.
+    """
+
+    def __init__(self, config: IncrementalTrainerConfig = None):
+        self.config = config or IncrementalTrainerConfig()
+
+    def _load_target_encoding_stats(self, preprocessor):
+        if os.path.exists(self.config.target_encoding_stats_file_path):
+            return load_object(self.config.target_encoding_stats_file_path)
+
+        # Artifacts produced before the statistics were saved: rebuild them from the train split
+        logging.info("Target encoding statistics not found, rebuilding them from the train split")
+        train_df = pd.read_csv(self.config.train_data_path)
+        imputer = preprocessor.named_transformers_["target_enc"].named_steps["imputer"]
+        return TargetEncodingStats(CAT_TARGET_ENC_COLS).update(
+            imputer.transform(train_df[CAT_TARGET_ENC_COLS]),
+            train_df[TARGET_COLUMN]
+        )
+
+    def _full_retrain(self, base_model, new_df):
+        train_df = pd.concat([pd.read_csv(self.config.train_data_path), new_df], ignore_index=True)
+        X = train_df.drop(columns=[TARGET_COLUMN])
+        y = train_df[TARGET_COLUMN]
+
+        start = time.perf_counter()
+        preprocessor = DataTransformation().get_data_transformation_object()
+        model = clone(base_model)
+        model.fit(preprocessor.fit_transform(X, y), y)
+        return preprocessor, model, time.perf_counter() - start
+
+    def initiate_incremental_training(self, new_data_path):
+        try:
+            logging.info("Incremental training started")
+            new_df = pd.read_csv(new_data_path)
+            logging.info(f"Loaded {len(new_df)} new records from {new_data_path}")
+
+            # Untouched copies of the current artifacts serve as the drift reference
+            base_preprocessor = load_object(self.config.preprocessor_file_path)
+            base_model = load_object(self.config.trained_model_file_path)
+            preprocessor = load_object(self.config.preprocessor_file_path)
+            model = load_object(self.config.trained_model_file_path)
+
+            rf = model.named_steps["clf"] if hasattr(model, "named_steps") else model
+            if not isinstance(rf, RandomForestClassifier):
+                raise ValueError(
+                    f"Incremental training needs a RandomForestClassifier, found {type(rf).__name__}; run a full retrain"
+                )
+
+            start = time.perf_counter()
+
+            # ------------------- Target Encoding Statistics -------------------
+            stats = self._load_target_encoding_stats(preprocessor)
+            target_enc_pipeline = preprocessor.named_transformers_["target_enc"]
+            stats.update(
+                target_enc_pipeline.named_steps["imputer"].transform(new_df[CAT_TARGET_ENC_COLS]),
+                new_df[TARGET_COLUMN]
+            )
+            stats.apply_to(target_enc_pipeline.named_steps["target_enc"])
+            logging.info("Target encoding mapping refreshed from new records")
+
+            # ------------------- Recent Training Rows -------------------
+            fit_df = new_df
+            if self.config.replay_fraction > 0 and os.path.exists(self.config.train_data_path):
+                replay_df = pd.read_csv(self.config.train_data_path).sample(
+                    frac=self.config.replay_fraction, random_state=42
+                )
+                fit_df = pd.concat([new_df, replay_df], ignore_index=True)
+
+            X_fit = preprocessor.transform(fit_df.drop(columns=[TARGET_COLUMN]))
+            y_fit = fit_df[TARGET_COLUMN].to_numpy()
+
+            missing_classes = set(rf.classes_) - set(np.unique(y_fit))
+            if missing_classes:
+                raise ValueError(
+                    f"New records lack classes {sorted(missing_classes, key=str)}; raise replay_fraction or run a full retrain"
+                )
+
+            smote = model.named_steps.get("smote") if hasattr(model, "named_steps") else None
+            if smote is not None:
+                try:
+                    X_fit, y_fit = smote.fit_resample(X_fit, y_fit)
+                except ValueError as e:
+                    logging.info(f"Skipping SMOTE for incremental rows: {e}")
+
+            # ------------------- Warm Start Forest -------------------
+            trees_before = len(rf.estimators_)
+            rf.set_params(warm_start=True, n_estimators=trees_before + self.config.new_trees)
+            rf.fit(X_fit, y_fit)
+
+            evicted = max(0, len(rf.estimators_) - self.config.max_trees)
+            if evicted:
+                rf.estimators_ = rf.estimators_[evicted:]
+            rf.set_params(warm_start=False, n_estimators=len(rf.estimators_))
+
+            train_seconds = time.perf_counter() - start
+            logging.info(
+                f"Added {self.config.new_trees} trees, evicted {evicted} oldest, forest size {len(rf.estimators_)} "
+                f"({train_seconds:.2f}s)"
+            )
+
+            # ------------------- Drift Report -------------------
+            if os.path.exists(self.config.test_data_path):
+                eval_df = pd.read_csv(self.config.test_data_path)
+            else:
+                eval_df = new_df
+            X_eval = eval_df.drop(columns=[TARGET_COLUMN])
+            y_eval = eval_df[TARGET_COLUMN]
+
+            report = {
+                "vs_previous": compare_models((base_preprocessor, base_model), (preprocessor, model), X_eval, y_eval)
+            }
+
+            if self.config.compare_full_retrain:
+                logging.info("Running full retrain for drift comparison")
+                full_preprocessor, full_model, full_seconds = self._full_retrain(base_model, new_df)
+                report["vs_full_retrain"] = compare_models(
+                    (full_preprocessor, full_model), (preprocessor, model), X_eval, y_eval
+                )
+                report["full_retrain_seconds"] = full_seconds
+                report["time_fraction_of_full_retrain"] = train_seconds / full_seconds if full_seconds else None
+
+            # ------------------- Save Versioned Artifacts -------------------
+            version = datetime.now().strftime("%Y%m%d%H%M%S") + "-incremental"
+            version_dir = os.path.join(self.config.versions_dir, version)
+
+            save_object(os.path.join(version_dir, "preprocessor.pkl"), preprocessor)
+            save_object(os.path.join(version_dir, "random_forest_model.pkl"), model)
+            save_object(os.path.join(version_dir, "target_encoding_stats.pkl"), stats)
+
+            metadata = {
+                "version": version,
+                "mode": "incremental",
+                "new_records": int(len(new_df)),
+                "trained_rows": int(len(y_fit)),
+                "trees_added": self.config.new_trees,
+                "trees_evicted": evicted,
+                "forest_size": len(rf.estimators_),
+                "train_seconds": train_seconds,
+                "drift": report,
+            }
+            save_json(os.path.join(version_dir, "metadata.json"), metadata)
+            logging.info(f"Incremental model version saved at {version_dir}")
+
+            if self.config.promote:
+                save_object(self.config.preprocessor_file_path, preprocessor)
+                save_object(self.config.trained_model_file_path, model)
+                save_object(self.config.target_encoding_stats_file_path, stats)
+                save_json(self.config.model_version_file_path, {"version": version, "path": version_dir})
+                logging.info(f"Promoted model version {version} to serving artifacts")
+
+            return version_dir, metadata
+
+        except Exception as e:
+            logging.error("Exception occurred at Incremental Training")
+            raise CustomException(e, sys)
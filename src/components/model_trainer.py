@@ -1,36 +1,45 @@
 import os
 import sys
 import pickle
+from datetime import datetime
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import shap
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 from imblearn.over_sampling import SMOTE
 from imblearn.pipeline import Pipeline as ImbPipeline
 from src.exception import CustomException
 from src.logger import logging
+from src.utils import evaluate_model, evaluate_model_latency, select_pareto_model, save_json, load_object
+from src.components.data_transformation import TARGET_COLUMN
 from dataclasses import dataclass
 
 @dataclass
 class ModelTrainerConfig:
     trained_model_file_path = os.path.join("artifacts", "random_forest_model.pkl")
+    model_selection_report_path = os.path.join("artifacts", "model_selection.json")
+    model_version_file_path = os.path.join("artifacts", "model_version.json")
     confusion_matrix_path = os.path.join("Notebook", "confusion_matrix.png")
     shap_summary_path = os.path.join("Notebook", "shap_summary.png")
+    # Budget for preprocessor + model on one raw row, the cost every served request pays
+    serving_latency_budget_ms = float(os.getenv("SERVING_LATENCY_BUDGET_MS", "10"))
 
 class ModelTrainer:
     def __init__(self):
         self.config = ModelTrainerConfig()
 
-    def initiate_model_training(self, train_arr, test_arr):
-        try:
-            logging.info("Splitting features and target from train and test arrays")
-            X_train, y_train = train_arr[:, :-1], train_arr[:, -1]
-            X_test, y_test = test_arr[:, :-1], test_arr[:, -1]
+    def get_candidate_models(self):
+        """
+        Candidate backends, each behind the same SMOTE step.
 
-            logging.info("Creating RandomForest Pipeline with SMOTE")
-            model = ImbPipeline(steps=[
+        The histogram booster is trained on the target-encoded matrix the
+        served preprocessor produces, so it stays a drop-in replacement for
+        the forest behind preprocessor.pkl.
+        """
+        return {
+            "random_forest": ImbPipeline(steps=[
                 ("smote", SMOTE(random_state=42)),
                 ("clf", RandomForestClassifier(
                     n_estimators=300,
@@ -38,17 +47,79 @@ class ModelTrainer:
                     random_state=42,
                     class_weight="balanced"
                 ))
-            ])
+            ]),
+            "hist_gradient_boosting": ImbPipeline(steps=[
+                ("smote", SMOTE(random_state=42)),
+                ("clf", HistGradientBoostingClassifier(
+                    max_iter=200,
+                    learning_rate=0.1,
+                    random_state=42,
+                    class_weight="balanced"
+                ))
+            ]),
+            "shallow_forest": ImbPipeline(steps=[
+                ("smote", SMOTE(random_state=42)),
+                ("clf", RandomForestClassifier(
+                    n_estimators=100,
+                    max_depth=8,
+                    random_state=42,
+                    class_weight="balanced"
+                ))
+            ]),
+        }
+
+    def initiate_model_training(self, train_arr, test_arr, preprocessor_path, raw_test_df):
+        """
+        Args:
+            train_arr, test_arr: transformed features with the target as last column
+            preprocessor_path: the fitted preprocessor that produced train_arr/test_arr
+            raw_test_df: the test split before transformation, for serving latency
+        """
+        try:
+            logging.info("Splitting features and target from train and test arrays")
+            X_train, y_train = train_arr[:, :-1], train_arr[:, -1]
+            X_test, y_test = test_arr[:, :-1], test_arr[:, -1]
 
-            logging.info("Training RandomForest Model")
-            model.fit(X_train, y_train)
+            # ------------------- Candidate Backends -------------------
+            logging.info("Training candidate models")
+            models = self.get_candidate_models()
+            accuracy_report, class_reports, _ = evaluate_model(
+                X_train, y_train, X_test, y_test, models, plot_confusion=False
+            )
+            # Timed on raw test rows through the fitted preprocessor, like a served request
+            latency_report = evaluate_model_latency(
+                models, raw_test_df.drop(columns=[TARGET_COLUMN], errors="ignore"),
+                preprocessor=load_object(preprocessor_path)
+            )
+
+            metrics = {
+                name: {
+                    "accuracy": accuracy_report[name],
+                    "f1_macro": class_reports[name]["macro avg"]["f1-score"],
+                    **latency_report[name],
+                }
+                for name in models
+            }
+
+            selected, front = select_pareto_model(metrics, self.config.serving_latency_budget_ms)
+            model = models[selected]
+            logging.info(f"Pareto front: {front}, selected model: {selected}")
+
+            save_json(self.config.model_selection_report_path, {
+                "selected": selected,
+                "pareto_front": front,
+                "serving_latency_budget_ms": self.config.serving_latency_budget_ms,
+                "latency_scope": "preprocessor + model, raw test rows",
+                "candidates": metrics,
+            })
+            logging.info(f"Model selection report saved at {self.config.model_selection_report_path}")
 
             logging.info("Making Predictions")
             y_pred = model.predict(X_test)
-            y_prob = model.predict_proba(X_test)
 
             acc = accuracy_score(y_test, y_pred)
             logging.info(f"Test Accuracy: {acc}")
+            print(f"Selected model: {selected}")
             print(f"Accuracy: {acc}")
             print("\nClassification Report:\n", classification_report(y_test, y_pred))
 
@@ -56,7 +127,7 @@ class ModelTrainer:
             cm = confusion_matrix(y_test, y_pred)
             plt.figure(figsize=(7,5))
             sns.heatmap(cm, annot=True, fmt='d', cmap="Blues")
-            plt.title("Confusion Matrix")
+            plt.title(f"Confusion Matrix - {selected}")
             plt.xlabel("Predicted")
             plt.ylabel("Actual")
             os.makedirs(os.path.dirname(self.config.confusion_matrix_path), exist_ok=True)
@@ -66,22 +137,32 @@ class ModelTrainer:
 
             # ------------------- SHAP -------------------
             logging.info("Calculating SHAP values")
-            rf = model.named_steps["clf"]
-            explainer = shap.TreeExplainer(rf)
-            shap_values = explainer.shap_values(X_train)
-
-            plt.figure()
-            shap.summary_plot(shap_values, X_train, show=False)
-            os.makedirs(os.path.dirname(self.config.shap_summary_path), exist_ok=True)
-            plt.savefig(self.config.shap_summary_path, bbox_inches='tight')
-            plt.close()
-            logging.info(f"SHAP summary plot saved at {self.config.shap_summary_path}")
+            try:
+                clf = model.named_steps["clf"]
+                explainer = shap.TreeExplainer(clf)
+                shap_values = explainer.shap_values(X_train)
+
+                plt.figure()
+                shap.summary_plot(shap_values, X_train, show=False)
+                os.makedirs(os.path.dirname(self.config.shap_summary_path), exist_ok=True)
+                plt.savefig(self.config.shap_summary_path, bbox_inches='tight')
+                plt.close()
+                logging.info(f"SHAP summary plot saved at {self.config.shap_summary_path}")
+            except Exception as e:
+                # TreeExplainer does not cover every backend (e.g. multiclass histogram boosting)
+                logging.warning(f"Skipping SHAP summary for {selected}: {e}")
 
             # ------------------- Save Model -------------------
+            # The serving path keeps the historical file name whichever backend wins
             os.makedirs(os.path.dirname(self.config.trained_model_file_path), exist_ok=True)
             with open(self.config.trained_model_file_path, "wb") as f:
                 pickle.dump(model, f)
-            logging.info(f"RandomForest model saved at {self.config.trained_model_file_path}")
+            logging.info(f"{selected} model saved at {self.config.trained_model_file_path}")
+
+            # A full retrain replaces any promoted incremental version, so its label goes too
+            version = datetime.now().strftime("%Y%m%d%H%M%S") + "-full"
+            save_json(self.config.model_version_file_path, {"version": version, "path": None})
+            logging.info(f"Serving model version set to {version}")
 
             return model, acc
 
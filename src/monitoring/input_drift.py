@@ -0,0 +1,398 @@
+"""Constant-memory streaming sketches of serving inputs for drift monitoring."""
+
+import hashlib
+import math
+import sys
+import threading
+import numpy as np
+import pandas as pd
+from src.exception import CustomException
+from src.logger import logging
+
+
+def _hash_bytes(value) -> bytes:
+    # str() keeps hashing stable across processes, unlike the salted built-in hash()
+    return str(value).encode("utf-8")
+
+
+class CountMinSketch:
+    """Point-frequency estimates for an unbounded set of values in depth x width counters."""
+
+    # Sketches hashed differently cannot be merged or compared
+    HASH_SCHEME = "blake2b"
+
+    def __init__(self, width: int = 1024, depth: int = 4):
+        if not 1 <= depth <= 16:
+            raise ValueError("Count-min sketch depth must be between 1 and 16")
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.hash_scheme = self.HASH_SCHEME
+
+    def _indexes(self, value):
+        # One 32-bit slice of a single digest per row: the rows hash independently
+        digest = hashlib.blake2b(_hash_bytes(value), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * row:4 * row + 4], "little") % self.width for row in range(self.depth)]
+
+    def compatible_with(self, other: "CountMinSketch") -> bool:
+        # Sketches pickled before hash_scheme existed used seeded CRC32 rows
+        return (self.width, self.depth, getattr(self, "hash_scheme", "crc32")) == \
+            (other.width, other.depth, getattr(other, "hash_scheme", "crc32"))
+
+    def add(self, value, count: int = 1) -> None:
+        for row, idx in enumerate(self._indexes(value)):
+            self.table[row, idx] += count
+        self.total += count
+
+    def estimate(self, value) -> int:
+        return int(min(self.table[row, idx] for row, idx in enumerate(self._indexes(value))))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if not self.compatible_with(other):
+            raise ValueError("Cannot merge count-min sketches of different shapes or hash schemes")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "hash_scheme": self.hash_scheme,
+            "total": self.total,
+            "table": self.table.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state["width"], state["depth"])
+        sketch.table = np.asarray(state["table"], dtype=np.int64)
+        sketch.total = state["total"]
+        sketch.hash_scheme = state.get("hash_scheme", "crc32")
+        return sketch
+
+
+class HeavyHitters:
+    """Misra-Gries summary keeping at most k candidate frequent values."""
+
+    def __init__(self, k: int = 64):
+        self.k = k
+        self.counters = {}
+
+    def add(self, value, count: int = 1) -> None:
+        counters = self.counters
+        counters[value] = counters.get(value, 0) + count
+        if len(counters) > self.k:
+            self._shrink()
+
+    def _shrink(self) -> None:
+        # Subtract the (k+1)-th largest count so at most k counters survive
+        cutoff = sorted(self.counters.values(), reverse=True)[self.k]
+        self.counters = {value: c - cutoff for value, c in self.counters.items() if c > cutoff}
+
+    def top(self, n: int = None):
+        items = sorted(self.counters.items(), key=lambda item: item[1], reverse=True)
+        return items[:n] if n else items
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        for value, count in other.counters.items():
+            self.counters[value] = self.counters.get(value, 0) + count
+        if len(self.counters) > self.k:
+            self._shrink()
+        return self
+
+    def to_dict(self):
+        return {"k": self.k, "counters": [[value, count] for value, count in self.counters.items()]}
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state["k"])
+        sketch.counters = {value: count for value, count in state["counters"]}
+        return sketch
+
+
+class QuantileSketch:
+    """
+    DDSketch-style quantile sketch: values fall into logarithmic buckets so
+    every quantile is returned within the configured relative accuracy.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value, count: int = 1) -> None:
+        if value is None or value != value:
+            return
+        if value <= 0:
+            self.zero_count += count
+        else:
+            idx = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[idx] = self.buckets.get(idx, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        self.count += count
+
+    def bucketize(self, values):
+        """(zero count, bucket index -> count, value count) of a batch, leaving the sketch untouched."""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        positive = values[values > 0]
+        bucket_counts = {}
+        if len(positive):
+            idx, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype(int), return_counts=True)
+            bucket_counts = dict(zip(idx.tolist(), counts.tolist()))
+        return int((values <= 0).sum()), bucket_counts, len(values)
+
+    def add_buckets(self, zero_count: int, bucket_counts: dict, count: int) -> None:
+        for i, c in bucket_counts.items():
+            self.buckets[i] = self.buckets.get(i, 0) + c
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += zero_count
+        self.count += count
+
+    def add_many(self, values) -> None:
+        self.add_buckets(*self.bucketize(values))
+
+    def _collapse(self) -> None:
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+    def _bucket_value(self, idx: int) -> float:
+        return 2 * self.gamma ** idx / (self.gamma + 1)
+
+    def quantile(self, q: float):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if rank < seen:
+                return self._bucket_value(idx)
+        return self._bucket_value(max(self.buckets))
+
+    def cdf(self, value: float) -> float:
+        if self.count == 0:
+            return 0.0
+        below = self.zero_count if value >= 0 else 0
+        for idx, c in self.buckets.items():
+            if self._bucket_value(idx) <= value:
+                below += c
+        return below / self.count
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if self.relative_accuracy != other.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different accuracy")
+        for idx, c in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + c
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "buckets": [[idx, c] for idx, c in self.buckets.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state["relative_accuracy"], state["max_buckets"])
+        sketch.buckets = {int(idx): c for idx, c in state["buckets"]}
+        sketch.zero_count = state["zero_count"]
+        sketch.count = state["count"]
+        return sketch
+
+
+class InputDriftMonitor:
+    """
+    Per-column sketches of the rows sent for prediction.
+
+    Categorical columns get a count-min sketch plus heavy hitters and an
+    unseen-category counter against the categories the fitted TargetEncoder
+    knows; the numerical column gets a quantile sketch. Memory is fixed by
+    the sketch sizes, and monitors from several workers can be merged.
+    """
+
+    def __init__(self, categorical_cols, numerical_col="Age", known_categories=None,
+                 cms_width=1024, cms_depth=4, heavy_hitters_k=64, relative_accuracy=0.01):
+        self.categorical_cols = list(categorical_cols)
+        self.numerical_col = numerical_col
+        self.known_categories = {col: set(values) for col, values in (known_categories or {}).items()}
+        self.frequencies = {col: CountMinSketch(cms_width, cms_depth) for col in self.categorical_cols}
+        self.heavy_hitters = {col: HeavyHitters(heavy_hitters_k) for col in self.categorical_cols}
+        self.unseen = {col: 0 for col in self.categorical_cols}
+        self.quantiles = QuantileSketch(relative_accuracy)
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor, categorical_cols, numerical_col="Age", **kwargs):
+        """Builds an empty monitor that knows the categories of a fitted preprocessor."""
+        target_encoder = preprocessor.named_transformers_["target_enc"].named_steps["target_enc"]
+        ordinal_mapping = {entry["col"]: entry["mapping"] for entry in target_encoder.ordinal_encoder.mapping}
+        known_categories = {
+            col: [value for value in ordinal_mapping[enc_col].index if value == value]
+            for enc_col, col in zip(target_encoder.cols, categorical_cols)
+        }
+        return cls(categorical_cols, numerical_col, known_categories, **kwargs)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def update(self, record: dict) -> None:
+        """Adds one request record (column name -> value)."""
+        with self._lock:
+            for col in self.categorical_cols:
+                value = record.get(col)
+                self.frequencies[col].add(value)
+                self.heavy_hitters[col].add(value)
+                known = self.known_categories.get(col)
+                if known is not None and value not in known:
+                    self.unseen[col] += 1
+            self.quantiles.add(record.get(self.numerical_col))
+            self.rows += 1
+
+    def update_frame(self, df: pd.DataFrame) -> None:
+        """Adds a batch of rows, counting each distinct value once per batch."""
+        # Counting the batch is the slow part and runs unlocked; the lock only covers merging the counts
+        column_counts = {col: df[col].value_counts(dropna=False) for col in self.categorical_cols}
+        numerical_buckets = self.quantiles.bucketize(df[self.numerical_col])
+        with self._lock:
+            for col in self.categorical_cols:
+                value_counts = column_counts[col]
+                known = self.known_categories.get(col)
+                for value, count in zip(value_counts.index.tolist(), value_counts.tolist()):
+                    if value != value:
+                        value = None
+                    self.frequencies[col].add(value, count)
+                    self.heavy_hitters[col].add(value, count)
+                    if known is not None and value not in known:
+                        self.unseen[col] += count
+            self.quantiles.add_buckets(*numerical_buckets)
+            self.rows += len(df)
+
+    def compatible_with(self, other: "InputDriftMonitor") -> bool:
+        """True when other sketches the same columns with the same frequency-sketch hashing."""
+        return self.categorical_cols == other.categorical_cols and all(
+            self.frequencies[col].compatible_with(other.frequencies[col]) for col in self.categorical_cols
+        )
+
+    def merge(self, other: "InputDriftMonitor") -> "InputDriftMonitor":
+        with self._lock:
+            for col in self.categorical_cols:
+                self.frequencies[col].merge(other.frequencies[col])
+                self.heavy_hitters[col].merge(other.heavy_hitters[col])
+                self.unseen[col] += other.unseen[col]
+            self.quantiles.merge(other.quantiles)
+            self.rows += other.rows
+        return self
+
+    def to_dict(self):
+        """JSON-friendly state, e.g. to collect and merge sketches from several workers."""
+        with self._lock:
+            return {
+                "categorical_cols": self.categorical_cols,
+                "numerical_col": self.numerical_col,
+                "known_categories": {col: sorted(values, key=str) for col, values in self.known_categories.items()},
+                "rows": self.rows,
+                "unseen": dict(self.unseen),
+                "frequencies": {col: sketch.to_dict() for col, sketch in self.frequencies.items()},
+                "heavy_hitters": {col: sketch.to_dict() for col, sketch in self.heavy_hitters.items()},
+                "quantiles": self.quantiles.to_dict(),
+            }
+
+    @classmethod
+    def from_dict(cls, state):
+        monitor = cls(state["categorical_cols"], state["numerical_col"], state["known_categories"])
+        monitor.rows = state["rows"]
+        monitor.unseen = dict(state["unseen"])
+        monitor.frequencies = {col: CountMinSketch.from_dict(s) for col, s in state["frequencies"].items()}
+        monitor.heavy_hitters = {col: HeavyHitters.from_dict(s) for col, s in state["heavy_hitters"].items()}
+        monitor.quantiles = QuantileSketch.from_dict(state["quantiles"])
+        return monitor
+
+    def compare(self, baseline: "InputDriftMonitor", top_n: int = 10):
+        """
+        Compares the live sketches against a training-time snapshot.
+
+        Returns:
+            dict with, per categorical column, the unseen-category rate, the L1
+            distance between live and baseline shares of the heavy hitters and
+            the top live values; for the numerical column, quantiles of both
+            and the population stability index over baseline deciles.
+        """
+        try:
+            if not self.compatible_with(baseline):
+                raise ValueError("Baseline sketches use a different shape or hash scheme")
+            report = {"rows": self.rows, "baseline_rows": baseline.rows, "categorical": {}}
+            if self.rows == 0:
+                return report
+
+            for col in self.categorical_cols:
+                live_cms, base_cms = self.frequencies[col], baseline.frequencies[col]
+                keys = set(self.heavy_hitters[col].counters) | set(baseline.heavy_hitters[col].counters)
+                live_share = {key: live_cms.estimate(key) / live_cms.total for key in keys}
+                base_share = {key: base_cms.estimate(key) / max(base_cms.total, 1) for key in keys}
+
+                report["categorical"][col] = {
+                    "unseen_rate": self.unseen[col] / self.rows,
+                    "heavy_hitter_l1": float(sum(abs(live_share[key] - base_share[key]) for key in keys)),
+                    "top_values": [
+                        {"value": value, "live_share": live_share[value], "baseline_share": base_share[value]}
+                        for value, _ in self.heavy_hitters[col].top(top_n)
+                    ],
+                }
+
+            probs = [0.1, 0.25, 0.5, 0.75, 0.9]
+            edges = [baseline.quantiles.quantile(q) for q in np.linspace(0.1, 0.9, 9)]
+            live_cdf = [0.0] + [self.quantiles.cdf(edge) for edge in edges] + [1.0]
+            base_cdf = [0.0] + [baseline.quantiles.cdf(edge) for edge in edges] + [1.0]
+            psi = 0.0
+            for i in range(len(live_cdf) - 1):
+                p = max(live_cdf[i + 1] - live_cdf[i], 1e-6)
+                q = max(base_cdf[i + 1] - base_cdf[i], 1e-6)
+                psi += (p - q) * math.log(p / q)
+
+            report["numerical"] = {
+                self.numerical_col: {
+                    "live_quantiles": {str(q): self.quantiles.quantile(q) for q in probs},
+                    "baseline_quantiles": {str(q): baseline.quantiles.quantile(q) for q in probs},
+                    "psi": psi,
+                }
+            }
+            return report
+
+        except Exception as e:
+            logging.error("Exception occurred while comparing input drift sketches")
+            raise CustomException(e, sys)
+
+
+def merge_monitors(states):
+    """Merges monitor states collected from several workers (dicts from to_dict)."""
+    monitors = [InputDriftMonitor.from_dict(state) for state in states]
+    merged = monitors[0]
+    for monitor in monitors[1:]:
+        merged.merge(monitor)
+    return merged
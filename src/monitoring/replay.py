@@ -0,0 +1,148 @@
+"""
+Replays captured traffic against a running instance and reports latency.
+
+    python -m src.monitoring.replay logs/traffic --target http://127.0.0.1:8000
+    python -m src.monitoring.replay logs/traffic --speed 4          # 4x the original rate
+    python -m src.monitoring.replay logs/traffic --max-rate --concurrency 32
+
+Sends requests with urllib and needs only NumPy besides the standard
+library, so it runs offline next to a local server.
+
+In paced mode latency is measured from each request's scheduled send
+time, so time spent waiting for a free client thread counts against the
+server (no coordinated omission); that wait is also reported on its own.
+"""
+
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.monitoring.traffic_capture import read_capture_file
+
+
+def load_capture(capture_dir):
+    """All captured records from every worker and rotation, ordered by timestamp."""
+    records = []
+    for path in glob.glob(os.path.join(capture_dir, "capture-*.gz*")):
+        records.extend(read_capture_file(path))
+    records.sort(key=lambda record: record[0]["ts"])
+    return records
+
+
+def _send(target, header, body, timeout, scheduled_at=None):
+    url = target.rstrip("/") + header["path"] + (f"?{header['query']}" if header["query"] else "")
+    request = urllib.request.Request(
+        url, data=body, method=header["method"],
+        headers={"Content-Type": header["content_type"] or "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = None
+    finished = time.perf_counter()
+    origin = scheduled_at if scheduled_at is not None else start
+    queue_delay_ms = (start - scheduled_at) * 1000 if scheduled_at is not None else 0.0
+    return header["path"], status, (finished - origin) * 1000, queue_delay_ms
+
+
+def _summarize(latencies_ms, statuses):
+    latencies = np.array(latencies_ms, dtype=float)
+    errors = sum(1 for status in statuses if status is None or status >= 400)
+    return {
+        "requests": len(statuses),
+        "errors": errors,
+        "error_rate": errors / len(statuses) if statuses else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+        "p90_ms": float(np.percentile(latencies, 90)) if len(latencies) else None,
+        "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+        "max_ms": float(latencies.max()) if len(latencies) else None,
+    }
+
+
+def replay(records, target, speed=1.0, max_rate=False, concurrency=16, timeout=60.0):
+    """
+    Sends records to target. With max_rate they are sent back to back by
+    `concurrency` threads; otherwise request i is scheduled at its original
+    offset from the first request divided by speed, and its latency runs
+    from that scheduled time.
+
+    Returns:
+        dict with overall and per-path latency percentiles, error rate,
+        throughput, how late the paced sends ran and how long requests
+        waited for a free client thread
+    """
+    results = []
+    lateness_ms = []
+    lock = threading.Lock()
+
+    def run(header, body, scheduled_at=None):
+        outcome = _send(target, header, body, timeout, scheduled_at)
+        with lock:
+            results.append(outcome)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if max_rate:
+            for header, body in records:
+                pool.submit(run, header, body)
+        else:
+            first_ts = records[0][0]["ts"] if records else 0.0
+            for header, body in records:
+                due = (header["ts"] - first_ts) / speed
+                delay = due - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    lateness_ms.append(-delay * 1000)
+                pool.submit(run, header, body, start + due)
+    elapsed = time.perf_counter() - start
+
+    by_path = defaultdict(lambda: ([], []))
+    queue_delays = np.array([r[3] for r in results], dtype=float)
+    for path, status, latency, _ in results:
+        by_path[path][0].append(latency)
+        by_path[path][1].append(status)
+
+    return {
+        "mode": "max_rate" if max_rate else f"{speed}x",
+        "elapsed_seconds": elapsed,
+        "throughput_rps": len(results) / elapsed if elapsed else 0.0,
+        "overall": _summarize([r[2] for r in results], [r[1] for r in results]),
+        "per_path": {path: _summarize(lat, st) for path, (lat, st) in by_path.items()},
+        "late_sends": len(lateness_ms),
+        "max_lateness_ms": max(lateness_ms) if lateness_ms else 0.0,
+        "queue_delay_p99_ms": float(np.percentile(queue_delays, 99)) if len(queue_delays) else 0.0,
+        "queue_delay_max_ms": float(queue_delays.max()) if len(queue_delays) else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay captured prediction traffic")
+    parser.add_argument("capture_dir")
+    parser.add_argument("--target", default="http://127.0.0.1:8000")
+    parser.add_argument("--speed", type=float, default=1.0, help="rate multiplier over the original timing")
+    parser.add_argument("--max-rate", action="store_true", help="ignore timing and send as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--report", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    captured = load_capture(args.capture_dir)
+    print(f"Replaying {len(captured)} captured requests against {args.target}")
+    report = replay(captured, args.target, args.speed, args.max_rate, args.concurrency, args.timeout)
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,146 @@
+"""Opt-in sampling of prediction requests into a compact rotating capture log."""
+
+import gzip
+import json
+import os
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from src.logger import logging
+
+
+@dataclass
+class TrafficCaptureConfig:
+    sample_rate: float = float(os.getenv("CAPTURE_SAMPLE_RATE", "0"))   # 0 disables capture
+    capture_dir: str = os.getenv("CAPTURE_DIR", os.path.join("logs", "traffic"))
+    max_bytes: int = int(os.getenv("CAPTURE_MAX_BYTES", str(50 * 1024 * 1024)))
+    backup_count: int = 5
+    queue_size: int = 10000
+    queue_max_bytes: int = int(os.getenv("CAPTURE_QUEUE_MAX_BYTES", str(64 * 1024 * 1024)))
+    flush_seconds: float = 1.0
+
+
+class TrafficCapture:
+    """
+    Writes a sampled fraction of requests to capture-<pid>.gz in capture_dir.
+
+    A record is a one-line JSON header (ts, method, path, query,
+    content_type, length) followed by the raw request body and a newline, so
+    replay sends back exactly the bytes the client sent. Request threads only
+    draw a random number and, when sampled, enqueue the bytes; a background
+    thread compresses and writes them, rotating to capture-<pid>.gz.1 ...
+    past max_bytes. Records are dropped, not waited on, once the queue holds
+    queue_size records or queue_max_bytes of bodies.
+    """
+
+    def __init__(self, config: TrafficCaptureConfig = None):
+        self.config = config or TrafficCaptureConfig()
+        self.enabled = self.config.sample_rate > 0
+        self.captured = 0
+        self.dropped = 0
+        self._queued_bytes = 0
+        self._bytes_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=self.config.queue_size)
+        self._thread = None
+        self._file = None
+        self._path = None
+
+    def should_sample(self) -> bool:
+        return self.enabled and random.random() < self.config.sample_rate
+
+    def capture(self, method: str, path: str, query: str, content_type: str, body: bytes) -> None:
+        header = {
+            "ts": time.time(),
+            "method": method,
+            "path": path,
+            "query": query,
+            "content_type": content_type,
+            "length": len(body),
+        }
+        with self._bytes_lock:
+            if self._queued_bytes + len(body) > self.config.queue_max_bytes:
+                self.dropped += 1
+                return
+            self._queued_bytes += len(body)
+        try:
+            self._queue.put_nowait((header, body))
+        except queue.Full:
+            with self._bytes_lock:
+                self._queued_bytes -= len(body)
+                self.dropped += 1
+
+    # ------------------- Writer -------------------
+    def _open(self):
+        os.makedirs(self.config.capture_dir, exist_ok=True)
+        self._path = os.path.join(self.config.capture_dir, f"capture-{os.getpid()}.gz")
+        self._file = gzip.open(self._path, "ab", compresslevel=5)
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.config.backup_count - 1, 0, -1):
+            source = f"{self._path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self._path}.{i + 1}")
+        os.replace(self._path, f"{self._path}.1")
+        self._open()
+
+    def _write_loop(self):
+        self._open()
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.config.flush_seconds)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                break
+            if item:
+                header, body = item
+                self._file.write(json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n")
+                self._file.write(body + b"\n")
+                with self._bytes_lock:
+                    self._queued_bytes -= len(body)
+                self.captured += 1
+                # Compressed size so far; checked on every record so sustained load still rotates
+                if self._file.fileobj.tell() > self.config.max_bytes:
+                    self._rotate()
+                    last_flush = time.monotonic()
+            # Flushed on a timer, not only when the queue drains, so readers see recent records
+            if time.monotonic() - last_flush >= self.config.flush_seconds:
+                self._file.flush()
+                last_flush = time.monotonic()
+        self._file.close()
+
+    def start(self):
+        """Starts the writer thread; call in the serving process after fork."""
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self._write_loop, name="traffic-capture", daemon=True)
+            self._thread.start()
+            logging.info(f"Capturing {self.config.sample_rate:.2%} of prediction traffic to {self.config.capture_dir}")
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def read_capture_file(path):
+    """Yields (header, body) records from one capture file, tolerating a truncated tail."""
+    with gzip.open(path, "rb") as f:
+        while True:
+            try:
+                line = f.readline()
+                if not line:
+                    return
+                header = json.loads(line)
+                body = f.read(header["length"])
+                f.read(1)
+            except (EOFError, OSError, ValueError):
+                # Last record of a file whose writer was killed mid-write
+                return
+            if len(body) != header["length"]:
+                return
+            yield header, body
@@ -1,16 +1,81 @@
 import sys
 import os
+import re
+import numpy as np
 import pandas as pd
 from src.exception import CustomException
 from src.logger import logging
 from src.utils import load_object
+from src.components.data_transformation import NUMERICAL_COLS, CAT_TARGET_ENC_COLS
+
+# Columns the preprocessor keeps; names and company are dropped before the model
+MODEL_FEATURE_COLS = NUMERICAL_COLS + CAT_TARGET_ENC_COLS
+
+
+def deduplicate_features(features: pd.DataFrame):
+    """
+    Finds the distinct rows of features on the model columns.
+
+    Returns:
+        unique_features: first occurrence of every distinct row, model columns only
+        inverse: for each input row, the position of its row in unique_features
+    """
+    keys = pd.util.hash_pandas_object(features[MODEL_FEATURE_COLS], index=False).to_numpy()
+    inverse, _ = pd.factorize(keys)
+    first_seen = ~pd.Series(keys).duplicated().to_numpy()
+    unique_features = features.iloc[np.flatnonzero(first_seen)][MODEL_FEATURE_COLS]
+    return unique_features, inverse
+
+
+def predict_deduplicated(score_fn, features: pd.DataFrame):
+    """
+    Scores only the distinct feature rows and scatters the results back to
+    the original row order.
+
+    Returns:
+        predictions for every row of features, dedup metadata dict
+    """
+    unique_features, inverse = deduplicate_features(features)
+    unique_predictions = np.asarray(score_fn(unique_features))
+    metadata = {
+        "rows": int(len(features)),
+        "unique_rows": int(len(unique_features)),
+        "dedup_ratio": len(features) / len(unique_features) if len(unique_features) else 1.0,
+    }
+    return unique_predictions[inverse], metadata
+
+
+MODELS_DIR = os.path.join('artifacts', 'models')
+
+# Every spelling of "the default model" accepted by the pipeline, registry and API
+DEFAULT_MODEL_KEYS = (None, "", "default")
+
+
+def normalize_model_key(model_key: str = None):
+    """None for any default alias, else the key unchanged."""
+    return None if model_key in DEFAULT_MODEL_KEYS else model_key
+
+
+def get_artifact_paths(model_key: str = None):
+    """
+    (preprocessor path, model path) of a model key. No key (or "" / "default")
+    means the default artifacts/ pair; other keys live in artifacts/models/<model_key>/.
+    """
+    model_key = normalize_model_key(model_key)
+    if model_key is None:
+        return os.path.join('artifacts', 'preprocessor.pkl'), os.path.join('artifacts', 'random_forest_model.pkl')
+    if not re.fullmatch(r"[A-Za-z0-9_.-]+", model_key) or model_key.startswith("."):
+        raise ValueError(f"Invalid model key '{model_key}'")
+    model_dir = os.path.join(MODELS_DIR, model_key)
+    return os.path.join(model_dir, 'preprocessor.pkl'), os.path.join(model_dir, 'random_forest_model.pkl')
+
 
 class PredictPipeline:
-    def __init__(self):
+    def __init__(self, model_key: str = None):
         try:
             # Load preprocessor and trained RandomForest model
-            self.preprocessor_path = os.path.join('artifacts', 'preprocessor.pkl')
-            self.model_path = os.path.join('artifacts', 'random_forest_model.pkl')
+            self.model_key = normalize_model_key(model_key)
+            self.preprocessor_path, self.model_path = get_artifact_paths(model_key)
 
             self.preprocessor = load_object(self.preprocessor_path)
             self.model = load_object(self.model_path)
@@ -20,20 +85,58 @@ class PredictPipeline:
             logging.error("Error initializing PredictPipeline")
             raise CustomException(e, sys)
 
-    def predict(self, features: pd.DataFrame):
+    def _score(self, features: pd.DataFrame):
+        # Transform features using the saved preprocessor
+        features_transformed = self.preprocessor.transform(features)
+
+        # Predict using the trained RandomForest model
+        return self.model.predict(features_transformed)
+
+    def predict_with_metadata(self, features: pd.DataFrame):
+        """Predicts every row while scoring each distinct feature row once."""
         try:
-            # Transform features using the saved preprocessor
-            features_transformed = self.preprocessor.transform(features)
-            
-            # Predict using the trained RandomForest model
-            predictions = self.model.predict(features_transformed)
-            return predictions
+            predictions, metadata = predict_deduplicated(self._score, features)
+            logging.info(f"Scored {metadata['rows']} rows ({metadata['unique_rows']} unique)")
+            return predictions, metadata
         except Exception as e:
             logging.error("Exception occurred during prediction")
             raise CustomException(e, sys)
 
+    def predict(self, features: pd.DataFrame):
+        return self.predict_with_metadata(features)[0]
+
+    def predict_proba(self, features: pd.DataFrame):
+        """Class probabilities per row, columns ordered as self.model.classes_."""
+        try:
+            score_proba = lambda unique: self.model.predict_proba(self.preprocessor.transform(unique))
+            return predict_deduplicated(score_proba, features)[0]
+        except Exception as e:
+            logging.error("Exception occurred during probability prediction")
+            raise CustomException(e, sys)
+
+
+CUSTOM_DATA_FIELDS = (
+    "Age",
+    "Gender",
+    "City",
+    "Highest_Qualification",
+    "Stream",
+    "Year_Of_Completion",
+    "Are_you_currently_working",
+    "Your_Designation",
+    "Employment_Type",
+    "First_Name",
+    "Last_Name",
+    "Company_Name",
+)
+
+COLUMN_DTYPES = {"Age": np.float64}
+
 
 class CustomData:
+    # Slots instead of a per-instance __dict__: a fraction of the memory per record
+    __slots__ = CUSTOM_DATA_FIELDS
+
     def __init__(self,
                  Age: float,
                  Gender: str,
@@ -62,24 +165,70 @@ class CustomData:
 
     def get_data_as_dataframe(self):
         try:
-            data_dict = {
-                "Age": [self.Age],
-                "Gender": [self.Gender],
-                "City": [self.City],
-                "Highest_Qualification": [self.Highest_Qualification],
-                "Stream": [self.Stream],
-                "Year_Of_Completion": [self.Year_Of_Completion],
-                "Are_you_currently_working": [self.Are_you_currently_working],
-                "Your_Designation": [self.Your_Designation],
-                "Employment_Type": [self.Employment_Type],
-                "First_Name": [self.First_Name],
-                "Last_Name": [self.Last_Name],
-                "Company_Name": [self.Company_Name],
-            }
-
-            df = pd.DataFrame(data_dict)
+            batch = CustomDataBatch(capacity=1, columns=CUSTOM_DATA_FIELDS)
+            batch.append(self)
+            df = batch.to_frame()
             logging.info("CustomData converted to DataFrame")
             return df
         except Exception as e:
             logging.error("Exception occurred while creating DataFrame from CustomData")
             raise CustomException(e, sys)
+
+
+class CustomDataBatch:
+    """
+    Collects CustomData-style records (CustomData, request models or dicts)
+    into preallocated column arrays and hands them to the preprocessor as
+    one DataFrame per batch instead of one per record.
+
+    Only the model columns are kept by default. Call reset() to reuse the
+    buffers for the next batch; they grow by doubling when full.
+    """
+
+    def __init__(self, capacity: int = 1024, columns=MODEL_FEATURE_COLS):
+        self.columns = tuple(columns)
+        self.size = 0
+        self._buffers = {col: np.empty(capacity, dtype=COLUMN_DTYPES.get(col, object)) for col in self.columns}
+
+    @classmethod
+    def from_records(cls, records, columns=MODEL_FEATURE_COLS):
+        batch = cls(capacity=max(len(records), 1), columns=columns)
+        batch.extend(records)
+        return batch
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        for col, buffer in self._buffers.items():
+            grown = np.empty(len(buffer) * 2, dtype=buffer.dtype)
+            grown[:self.size] = buffer[:self.size]
+            self._buffers[col] = grown
+
+    def append(self, record):
+        if self.size == len(self._buffers[self.columns[0]]):
+            self._grow()
+        row = self.size
+        if isinstance(record, dict):
+            for col in self.columns:
+                self._buffers[col][row] = record.get(col)
+        else:
+            for col in self.columns:
+                self._buffers[col][row] = getattr(record, col, None)
+        self.size += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def reset(self):
+        """Forgets the collected rows and keeps the buffers for the next batch."""
+        self.size = 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame over the filled part of the buffers, ready for
+        preprocessor.transform. It may share memory with the buffers, so use
+        it before the next reset().
+        """
+        return pd.DataFrame({col: self._buffers[col][:self.size] for col in self.columns}, copy=False)
@@ -0,0 +1,249 @@
+"""
+Materialized cohort score table with an on-disk hash index.
+
+    python -m src.pipelines.score_store cohort.csv [--id-column Student_ID]
+
+Builds (or incrementally refreshes) artifacts/score_store from a cohort
+file by running PredictPipeline; the API serves lookups from it.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import save_json, load_json, get_artifact_version
+from src.components.data_transformation import NUMERICAL_COLS, CAT_TARGET_ENC_COLS
+from src.pipelines.prediction_pipeline import PredictPipeline
+
+KEY_BYTES = 64
+
+RECORD_DTYPE = np.dtype([
+    ("key", f"S{KEY_BYTES}"),
+    ("feature_hash", "<u8"),
+    ("class_code", "<i2"),
+    ("probability", "<f4"),
+])
+
+
+@dataclass
+class ScoreStoreConfig:
+    store_dir: str = os.path.join("artifacts", "score_store")
+    id_column: str = os.getenv("STUDENT_ID_COLUMN", "Student_ID")
+    chunk_size: int = 50000
+
+
+def _key_hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def _canonical_category(value) -> str:
+    if value is None or value != value:
+        return ""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        # A blank in a chunk turns an int column into floats: 2020 and 2020.0 must hash alike
+        return str(int(value))
+    return str(value)
+
+
+def feature_hashes(chunk: pd.DataFrame) -> np.ndarray:
+    """
+    Hashes of the model columns in fixed dtypes (numerics float64,
+    categoricals str), independent of how read_csv inferred the chunk.
+    """
+    features = pd.DataFrame(index=chunk.index)
+    for col in NUMERICAL_COLS:
+        features[col] = pd.to_numeric(chunk[col], errors="coerce").astype("float64")
+    for col in CAT_TARGET_ENC_COLS:
+        features[col] = chunk[col].map(_canonical_category).astype(str)
+    return pd.util.hash_pandas_object(features, index=False).to_numpy()
+
+
+def build_index(keys) -> np.ndarray:
+    """Open-addressing table of record numbers + 1 (0 = empty slot), at most half full."""
+    n_slots = 1 << max(4, (2 * len(keys)).bit_length())
+    mask = n_slots - 1
+    index = np.zeros(n_slots, dtype="<u4")
+    for record_no, key in enumerate(keys):
+        slot = _key_hash(key) & mask
+        while index[slot]:
+            slot = (slot + 1) & mask
+        index[slot] = record_no + 1
+    return index
+
+
+class ScoreStore:
+    """
+    Fixed-width score records (records.dat) addressed by a linear-probing
+    hash index (index.dat), both memory-mapped, so a lookup reads a couple
+    of slots no matter how large the cohort is. meta.json records the model
+    version and class labels the scores were produced with.
+    """
+
+    def __init__(self, config: ScoreStoreConfig = None):
+        self.config = config or ScoreStoreConfig()
+        self.records_path = os.path.join(self.config.store_dir, "records.dat")
+        self.index_path = os.path.join(self.config.store_dir, "index.dat")
+        self.meta_path = os.path.join(self.config.store_dir, "meta.json")
+        self.meta = None
+        self._records = None
+        self._index = None
+        self._meta_mtime = None
+
+    # ------------------- Serving -------------------
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime != self._meta_mtime:
+            self.meta = load_json(self.meta_path)
+            if self.meta["records"]:
+                self._records = np.memmap(self.records_path, dtype=RECORD_DTYPE, mode="r")
+                self._index = np.memmap(self.index_path, dtype="<u4", mode="r")
+            else:
+                self._records, self._index = None, None
+            self._meta_mtime = mtime
+        return self._records is not None
+
+    def lookup(self, student_id):
+        """Returns the stored score of a student, or None when the id is not in the store."""
+        if not self._reload_if_changed():
+            return None
+        key = str(student_id).encode("utf-8")
+        if len(key) > KEY_BYTES:
+            return None
+
+        mask = len(self._index) - 1
+        slot = _key_hash(key) & mask
+        while True:
+            record_no = int(self._index[slot])
+            if record_no == 0:
+                return None
+            record = self._records[record_no - 1]
+            if record["key"] == key:
+                return {
+                    "student_id": str(student_id),
+                    "prediction": self.meta["classes"][int(record["class_code"])],
+                    "probability": float(record["probability"]),
+                    "model_version": self.meta["model_version"],
+                }
+            slot = (slot + 1) & mask
+
+    # ------------------- Build / Refresh -------------------
+    def _load_existing(self):
+        if not os.path.exists(self.meta_path):
+            return None, np.zeros(0, dtype=RECORD_DTYPE)
+        meta = load_json(self.meta_path)
+        if not meta["records"]:
+            return meta, np.zeros(0, dtype=RECORD_DTYPE)
+        return meta, np.fromfile(self.records_path, dtype=RECORD_DTYPE)
+
+    def _write(self, records, meta):
+        os.makedirs(self.config.store_dir, exist_ok=True)
+        index = build_index(records["key"].tolist())
+        records.tofile(self.records_path + ".tmp")
+        index.tofile(self.index_path + ".tmp")
+        os.replace(self.records_path + ".tmp", self.records_path)
+        os.replace(self.index_path + ".tmp", self.index_path)
+        # meta.json is replaced last: readers reload when it changes
+        save_json(self.meta_path + ".tmp", meta)
+        os.replace(self.meta_path + ".tmp", self.meta_path)
+
+    def refresh(self, cohort_path, pipeline: PredictPipeline = None):
+        """
+        Scores a cohort file into the store. Rows whose model columns are
+        unchanged since the last refresh keep their score; every row is
+        re-scored when the model version differs from the stored one.
+        Students missing from the cohort file keep their last score.
+
+        Returns:
+            dict with row counts (rescored, new, unchanged) and timing
+        """
+        try:
+            start = time.perf_counter()
+            pipeline = pipeline or PredictPipeline()
+            model_version = get_artifact_version(pipeline.preprocessor_path, pipeline.model_path)
+            classes = [c.item() if isinstance(c, np.generic) else c for c in pipeline.model.classes_]
+
+            meta, existing = self._load_existing()
+            full_refresh = meta is None or meta["model_version"] != model_version
+            position = {key: i for i, key in enumerate(existing["key"].tolist())}
+            appended = []
+            report = {"rows": 0, "rescored": 0, "new": 0, "unchanged": 0, "full_refresh": full_refresh}
+
+            for chunk in pd.read_csv(cohort_path, chunksize=self.config.chunk_size):
+                keys = chunk[self.config.id_column].astype(str).str.encode("utf-8").tolist()
+                too_long = [key for key in keys if len(key) > KEY_BYTES]
+                if too_long:
+                    raise ValueError(f"Student ids longer than {KEY_BYTES} bytes, e.g. {too_long[0]!r}")
+
+                hashes = feature_hashes(chunk)
+                positions = np.array([position.get(key, -1) for key in keys], dtype=np.int64)
+
+                to_score = np.ones(len(keys), dtype=bool)
+                if not full_refresh:
+                    known = (positions >= 0) & (positions < len(existing))
+                    stored_hashes = existing["feature_hash"][positions[known]]
+                    to_score[np.flatnonzero(known)] = stored_hashes != hashes[known]
+
+                report["rows"] += len(keys)
+                report["unchanged"] += int((~to_score).sum())
+                rows = np.flatnonzero(to_score)
+                if not len(rows):
+                    continue
+
+                proba = pipeline.predict_proba(chunk.iloc[rows])
+                codes = proba.argmax(axis=1)
+                top = proba.max(axis=1)
+
+                for row, code, probability in zip(rows.tolist(), codes.tolist(), top.tolist()):
+                    key, pos = keys[row], positions[row]
+                    if pos < 0:
+                        # Ids repeated within the file resolve to the record created first
+                        pos = position.get(key, -1)
+                    if pos < 0:
+                        pos = len(existing) + len(appended)
+                        position[key] = pos
+                        appended.append((key, hashes[row], code, probability))
+                        report["new"] += 1
+                    elif pos < len(existing):
+                        existing[pos] = (key, hashes[row], code, probability)
+                        report["rescored"] += 1
+                    else:
+                        appended[pos - len(existing)] = (key, hashes[row], code, probability)
+                        report["rescored"] += 1
+
+            records = np.concatenate([existing, np.array(appended, dtype=RECORD_DTYPE)])
+            self._write(records, {
+                "model_version": model_version,
+                "classes": classes,
+                "id_column": self.config.id_column,
+                "records": int(len(records)),
+                "refreshed_at": time.time(),
+            })
+
+            report["records"] = int(len(records))
+            report["seconds"] = time.perf_counter() - start
+            logging.info(f"Score store refreshed: {report}")
+            return report
+
+        except Exception as e:
+            logging.error("Exception occurred while refreshing the score store")
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or refresh the cohort score store")
+    parser.add_argument("cohort_csv")
+    parser.add_argument("--id-column", default=ScoreStoreConfig.id_column)
+    parser.add_argument("--store-dir", default=ScoreStoreConfig.store_dir)
+    args = parser.parse_args()
+
+    store = ScoreStore(ScoreStoreConfig(store_dir=args.store_dir, id_column=args.id_column))
+    print(store.refresh(args.cohort_csv))
@@ -22,8 +22,8 @@ if __name__ == "__main__":
      obj = DataIngestion()
      train_data_path, test_data_path = obj.initiate_data_ingestion()
      data_transformation = DataTransformation()
-     train_arr, test_arr,_ =data_transformation.initiate_data_transformation(train_data_path, test_data_path)
+     train_arr, test_arr, preprocessor_path = data_transformation.initiate_data_transformation(train_data_path, test_data_path)
      model_trainer = ModelTrainer()
-     model_trainer.initiate_model_training(train_arr, test_arr)
+     model_trainer.initiate_model_training(train_arr, test_arr, preprocessor_path, pd.read_csv(test_data_path))
      
      
\ No newline at end of file
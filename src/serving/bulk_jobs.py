@@ -0,0 +1,276 @@
+"""Asynchronous bulk-scoring jobs backed by a persistent on-disk queue."""
+
+import json
+import os
+import queue
+import re
+import shutil
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+import pandas as pd
+from src.exception import CustomException
+from src.logger import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process claim, run a single serving process
+    fcntl = None
+
+# Job ids are uuid4 hex strings; anything else never reaches a filesystem path
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def is_valid_job_id(job_id) -> bool:
+    return isinstance(job_id, str) and JOB_ID_PATTERN.match(job_id) is not None
+
+
+@dataclass
+class BulkJobConfig:
+    jobs_dir: str = os.path.join("artifacts", "jobs")
+    chunk_size: int = int(os.getenv("BULK_JOB_CHUNK_SIZE", "5000"))
+    workers: int = int(os.getenv("BULK_JOB_WORKERS", "2"))
+    rescan_seconds: float = 30.0      # how often idle workers look for orphaned jobs
+    prediction_column: str = "prediction"
+
+
+class BulkJobQueue:
+    """
+    Bulk-scoring jobs stored as directories under jobs_dir:
+
+        <job_id>/input.csv      uploaded dataset
+        <job_id>/status.json    state, total_rows, rows_done, timestamps, error
+        <job_id>/parts/         one scored CSV per finished chunk
+
+    Workers score input.csv chunk by chunk and publish each part with an
+    atomic rename, so after a restart a job resumes at the first chunk
+    without a part file. Across processes a job is claimed with an flock
+    on <job_id>/.lock, which the OS releases if the worker dies.
+
+    With a version_fn the job records the version of the model it started
+    with; if a different version is serving when a chunk is about to be
+    scored (e.g. a promotion happened while the job was interrupted), the
+    finished parts are discarded and the job is rescored from chunk 0, so
+    every result file comes from a single model.
+    """
+
+    ACTIVE_STATES = ("queued", "running")
+
+    def __init__(self, score_fn, required_columns, config: BulkJobConfig = None, version_fn=None):
+        # score_fn(chunk, model_key) -> 1-D array of predictions
+        # version_fn(model_key) -> version of the model score_fn currently uses
+        self.score_fn = score_fn
+        self.version_fn = version_fn
+        self.required_columns = list(required_columns)
+        self.config = config or BulkJobConfig()
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        os.makedirs(self.config.jobs_dir, exist_ok=True)
+
+    # ------------------- Paths & Status -------------------
+    def _job_dir(self, job_id):
+        if not is_valid_job_id(job_id):
+            raise ValueError(f"Invalid job id: {job_id!r}")
+        return os.path.join(self.config.jobs_dir, job_id)
+
+    def _input_path(self, job_id):
+        return os.path.join(self._job_dir(job_id), "input.csv")
+
+    def _parts_dir(self, job_id):
+        return os.path.join(self._job_dir(job_id), "parts")
+
+    def _part_path(self, job_id, index):
+        return os.path.join(self._parts_dir(job_id), f"part-{index:05d}.csv")
+
+    def _write_status(self, job_id, /, **updates):
+        path = os.path.join(self._job_dir(job_id), "status.json")
+        status = self.status(job_id) if os.path.exists(path) else {}
+        status.update(updates, updated_at=time.time())
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(status, f)
+        os.replace(tmp_path, path)
+        return status
+
+    def status(self, job_id):
+        """Returns the job status dict, or None for an unknown job id."""
+        if not is_valid_job_id(job_id):
+            return None
+        path = os.path.join(self._job_dir(job_id), "status.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    # ------------------- Submission -------------------
+    def create_job(self, model_key: str = None):
+        """Reserves a job id and returns (job_id, path the input CSV must be written to)."""
+        job_id = uuid.uuid4().hex
+        model_version = self.version_fn(model_key) if self.version_fn else None
+        os.makedirs(self._parts_dir(job_id))
+        self._write_status(job_id, job_id=job_id, state="uploading", created_at=time.time(),
+                           total_rows=0, rows_done=0, error=None, model_key=model_key,
+                           model_version=model_version)
+        return job_id, self._input_path(job_id)
+
+    def enqueue(self, job_id, total_rows: int = None):
+        """
+        Validates an uploaded input file and queues the job. Pass total_rows
+        when it was counted during the upload to skip re-reading the file.
+        """
+        header = pd.read_csv(self._input_path(job_id), nrows=0).columns
+        missing = [col for col in self.required_columns if col not in header]
+        if missing:
+            self._write_status(job_id, state="failed", error=f"Missing columns: {missing}")
+            raise ValueError(f"Missing columns: {missing}")
+
+        if total_rows is None:
+            with open(self._input_path(job_id), "rb") as f:
+                total_rows = max(sum(1 for _ in f) - 1, 0)
+
+        status = self._write_status(job_id, state="queued", total_rows=total_rows)
+        self._push(job_id)
+        logging.info(f"Bulk job {job_id} queued with {total_rows} rows")
+        return status
+
+    def submit_frame(self, df: pd.DataFrame, model_key: str = None):
+        job_id, input_path = self.create_job(model_key)
+        try:
+            df.to_csv(input_path, index=False)
+            return self.enqueue(job_id, total_rows=len(df))
+        except Exception:
+            self.delete(job_id)
+            raise
+
+    def _push(self, job_id):
+        with self._pending_lock:
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+        self._queue.put(job_id)
+
+    # ------------------- Results -------------------
+    def iter_results(self, job_id, block_size: int = 1 << 16):
+        """Yields the scored CSV of a finished job, parts concatenated with one header."""
+        parts = sorted(name for name in os.listdir(self._parts_dir(job_id)) if name.endswith(".csv"))
+        for i, part in enumerate(parts):
+            with open(os.path.join(self._parts_dir(job_id), part), "rb") as f:
+                if i > 0:
+                    f.readline()
+                while True:
+                    block = f.read(block_size)
+                    if not block:
+                        break
+                    yield block
+
+    def delete(self, job_id):
+        if not is_valid_job_id(job_id):
+            return
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+
+    def _clear_parts(self, job_id):
+        for name in os.listdir(self._parts_dir(job_id)):
+            os.remove(os.path.join(self._parts_dir(job_id), name))
+
+    # ------------------- Workers -------------------
+    def _claim(self, job_id):
+        if fcntl is None:
+            return True, None
+        lock_file = open(os.path.join(self._job_dir(job_id), ".lock"), "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True, lock_file
+        except OSError:
+            lock_file.close()
+            return False, None
+
+    def _process(self, job_id):
+        claimed, lock_file = self._claim(job_id)
+        if not claimed:
+            logging.info(f"Bulk job {job_id} is being processed by another worker")
+            return
+        try:
+            status = self.status(job_id)
+            if status is None or status["state"] not in self.ACTIVE_STATES:
+                return
+
+            self._write_status(job_id, state="running", started_at=status.get("started_at") or time.time())
+            model_key = status.get("model_key")
+            job_version = status.get("model_version")
+            restart = True
+            while restart:
+                restart = False
+                rows_done = 0
+                reader = pd.read_csv(self._input_path(job_id), chunksize=self.config.chunk_size)
+                for index, chunk in enumerate(reader):
+                    part_path = self._part_path(job_id, index)
+                    if not os.path.exists(part_path):
+                        current_version = self.version_fn(model_key) if self.version_fn else None
+                        if current_version != job_version:
+                            logging.info(f"Bulk job {job_id}: model changed from {job_version} to "
+                                         f"{current_version}, rescoring from the first chunk")
+                            self._clear_parts(job_id)
+                            job_version = current_version
+                            self._write_status(job_id, model_version=job_version, rows_done=0)
+                            restart = True
+                            break
+                        chunk[self.config.prediction_column] = self.score_fn(chunk, model_key)
+                        chunk.to_csv(part_path + ".tmp", index=False)
+                        os.replace(part_path + ".tmp", part_path)
+                    rows_done += len(chunk)
+                    self._write_status(job_id, rows_done=rows_done)
+                    if self._stop.is_set():
+                        logging.info(f"Bulk job {job_id} paused at {rows_done} rows for shutdown")
+                        return
+
+            self._write_status(job_id, state="done", total_rows=rows_done, rows_done=rows_done,
+                               finished_at=time.time())
+            logging.info(f"Bulk job {job_id} finished, {rows_done} rows scored")
+
+        except Exception as e:
+            logging.error(f"Bulk job {job_id} failed: {e}")
+            self._write_status(job_id, state="failed", error=str(CustomException(e, sys)))
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try:
+                job_id = self._queue.get(timeout=self.config.rescan_seconds)
+            except queue.Empty:
+                self.enqueue_pending()
+                continue
+            with self._pending_lock:
+                self._pending.discard(job_id)
+            self._process(job_id)
+
+    def enqueue_pending(self):
+        """Queues every job on disk that is still queued or was interrupted while running."""
+        for job_id in sorted(os.listdir(self.config.jobs_dir)):
+            if not is_valid_job_id(job_id):
+                continue
+            status = self.status(job_id)
+            if status is not None and status["state"] in self.ACTIVE_STATES:
+                self._push(job_id)
+
+    def start(self):
+        """Starts the worker threads; call after the serving process has forked."""
+        self._stop.clear()
+        self.enqueue_pending()
+        for i in range(self.config.workers):
+            thread = threading.Thread(target=self._worker, name=f"bulk-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logging.info(f"Bulk job workers started: {self.config.workers}")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
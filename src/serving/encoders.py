@@ -0,0 +1,137 @@
+"""Content-negotiated encodings for bulk prediction responses."""
+
+import json
+import numpy as np
+import pandas as pd
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+NUMPY_MEDIA_TYPE = "application/x-numpy"
+
+FORMATS = {
+    "json": JSON_MEDIA_TYPE,
+    "arrow": ARROW_MEDIA_TYPE,
+    "numpy": NUMPY_MEDIA_TYPE,
+}
+
+
+class UnsupportedFormat(Exception):
+    pass
+
+
+def negotiate_format(accept_header: str = None, format_param: str = None) -> str:
+    """
+    Picks the response format: an explicit ?format= wins, then the first
+    supported media type of the Accept header, then JSON.
+    """
+    if format_param:
+        if format_param not in FORMATS:
+            raise UnsupportedFormat(f"Unknown format '{format_param}', expected one of {list(FORMATS)}")
+        return format_param
+    for media_range in (accept_header or "").split(","):
+        media_type = media_range.split(";")[0].strip()
+        for name, supported in FORMATS.items():
+            if media_type == supported:
+                return name
+    return "json"
+
+
+def encode_json(payload: dict) -> bytes:
+    """Serializes a payload that may hold NumPy arrays without converting them to Python objects first."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def default(obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    return json.dumps(payload, default=default, separators=(",", ":")).encode("utf-8")
+
+
+def _class_codes(predictions, classes):
+    return pd.Categorical(predictions, categories=classes).codes.astype("<i2")
+
+
+def encode_predictions(fmt: str, predictions, classes, probabilities=None, metadata=None) -> Response:
+    """
+    Encodes bulk predictions.
+
+    Args:
+        fmt: "json", "arrow" or "numpy"
+        predictions: 1-D array of predicted labels
+        classes: label order of the model (and of the probability columns)
+        probabilities: optional (rows, n_classes) array
+        metadata: optional dict returned alongside the predictions
+
+    Formats:
+        json  - {"total_records", "predictions", "metadata"[, "classes", "probabilities"]};
+                probabilities are serialized straight from the array, but string
+                labels are object-dtype and still go through tolist(), so use
+                arrow or numpy (class codes) when label encoding cost matters
+        arrow - IPC stream: dictionary-encoded "prediction" column plus one
+                float32 "proba_<class>" column per class, metadata in the schema
+        numpy - raw little-endian int16 class codes, followed by float32
+                probabilities in row-major order; classes, shapes and dtypes
+                are described in X- response headers
+    """
+    classes = [c.item() if isinstance(c, np.generic) else c for c in classes]
+    metadata = metadata or {}
+
+    if fmt == "json":
+        labels = predictions.tolist() if predictions.dtype == object else predictions
+        payload = {"total_records": len(predictions), "predictions": labels, "metadata": metadata}
+        if probabilities is not None:
+            payload["classes"] = classes
+            payload["probabilities"] = np.ascontiguousarray(probabilities, dtype=np.float32)
+        return Response(encode_json(payload), media_type=JSON_MEDIA_TYPE)
+
+    codes = _class_codes(predictions, classes)
+
+    if fmt == "arrow":
+        if pa is None:
+            raise UnsupportedFormat("Arrow responses need pyarrow installed")
+        columns = {
+            "prediction": pa.DictionaryArray.from_arrays(
+                pa.array(codes, type=pa.int16()), pa.array([str(c) for c in classes])
+            )
+        }
+        if probabilities is not None:
+            for i, c in enumerate(classes):
+                columns[f"proba_{c}"] = pa.array(probabilities[:, i].astype(np.float32))
+        batch = pa.RecordBatch.from_pydict(columns)
+        batch = batch.replace_schema_metadata({"metadata": encode_json(metadata)})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return Response(sink.getvalue().to_pybytes(), media_type=ARROW_MEDIA_TYPE)
+
+    if fmt == "numpy":
+        headers = {
+            "X-Rows": str(len(codes)),
+            "X-Classes": encode_json(classes).decode("utf-8"),
+            "X-Prediction-Dtype": "<i2",
+            "X-Metadata": encode_json(metadata).decode("utf-8"),
+        }
+        body = codes.tobytes()
+        if probabilities is not None:
+            proba = np.ascontiguousarray(probabilities, dtype="<f4")
+            headers["X-Probability-Dtype"] = "<f4"
+            headers["X-Probability-Shape"] = f"{proba.shape[0]},{proba.shape[1]}"
+            body += proba.tobytes()
+        return Response(body, media_type=NUMPY_MEDIA_TYPE, headers=headers)
+
+    raise UnsupportedFormat(f"Unknown format '{fmt}'")
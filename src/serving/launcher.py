@@ -0,0 +1,303 @@
+"""
+Prefork launcher for the FastAPI app.
+
+The parent imports app.py (which unpickles the preprocessor and model),
+warms the preprocessor, freezes the heap from the garbage collector and
+only then forks the uvicorn workers, so the model pages stay shared
+copy-on-write instead of being duplicated per worker. The model itself is
+first scored in each worker, by the app's startup warm-up.
+
+    python -m src.serving.launcher --workers 4
+    python -m src.serving.launcher --measure 4    # memory scaling from 1 to 4 workers
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from src.exception import CustomException
+from src.logger import logging
+from src.serving.warmup import make_synthetic_frame, warm_up
+from src.pipelines.prediction_pipeline import get_artifact_paths
+from src.utils import load_object
+
+
+@dataclass
+class LauncherConfig:
+    app: str = "app:app"
+    host: str = os.getenv("HOST", "0.0.0.0")
+    port: int = int(os.getenv("PORT", "8000"))
+    workers: int = int(os.getenv("WEB_CONCURRENCY", "2"))
+    preload: bool = True
+    freeze: bool = True
+    backlog: int = 2048
+
+
+def import_app(app_path: str):
+    module_name, attr = app_path.split(":")
+    module = importlib.import_module(module_name)
+    return module, getattr(module, attr)
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def read_memory(pid: int):
+    """Unique (private) vs shared resident memory of a process in kB, from /proc smaps_rollup."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "unique_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared_kb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+class PreforkLauncher:
+    def __init__(self, config: LauncherConfig = None):
+        self.config = config or LauncherConfig()
+        self.module = None
+        self.app = None
+        self.sock = None
+        self.children = {}
+        self._stopping = False
+
+    def preload(self):
+        """Loads and warms the app once in the parent process."""
+        try:
+            start = time.perf_counter()
+            self.module, self.app = import_app(self.config.app)
+            load_seconds = time.perf_counter() - start
+
+            # Only the preprocessor runs before fork. Model scoring can start native
+            # thread pools (HistGradientBoosting predicts with OpenMP) and GNU OpenMP is
+            # not fork-safe, so the model is warmed after fork by the app's startup warm-up.
+            warm_up(self.module.preprocessor.transform, self.module.preprocessor)
+
+            if self.config.freeze:
+                # Move every surviving object to the permanent generation: later
+                # collections in the workers no longer write to those pages
+                gc.collect()
+                gc.freeze()
+            logging.info(f"App preloaded in {load_seconds:.2f}s, {gc.get_freeze_count()} objects frozen")
+        except Exception as e:
+            logging.error("Exception occurred while preloading the app")
+            raise CustomException(e, sys)
+
+    def _run_worker(self):
+        import uvicorn
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        app = self.app if self.app is not None else import_app(self.config.app)[1]
+        server = uvicorn.Server(uvicorn.Config(app, log_config=None))
+        server.run(sockets=[self.sock])
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self._run_worker()
+            except Exception:
+                logging.exception("Worker crashed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.children[pid] = time.time()
+        logging.info(f"Forked worker {pid}")
+        return pid
+
+    def start(self, workers: int = None):
+        if self.config.preload and self.app is None:
+            self.preload()
+        if self.sock is None:
+            self.sock = bind_socket(self.config.host, self.config.port, self.config.backlog)
+        for _ in range(workers or self.config.workers):
+            self.spawn()
+
+    def stop(self, timeout: float = 15.0):
+        self._stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.time() + timeout
+        while self.children and time.time() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid:
+                self.children.pop(pid, None)
+            else:
+                time.sleep(0.1)
+        for pid in list(self.children):
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.children.pop(pid)
+
+    def supervise(self):
+        """Restarts workers that exit until the launcher receives SIGTERM or SIGINT."""
+        def handle_signal(signum, frame):
+            self._stopping = True
+
+        signal.signal(signal.SIGTERM, handle_signal)
+        signal.signal(signal.SIGINT, handle_signal)
+
+        while not self._stopping:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if pid:
+                self.children.pop(pid, None)
+                logging.warning(f"Worker {pid} exited with status {status}, restarting")
+                self.spawn()
+            else:
+                time.sleep(0.5)
+        self.stop()
+
+    def run(self):
+        self.start()
+        logging.info(f"Serving {self.config.app} on {self.config.host}:{self.config.port} "
+                     f"with {len(self.children)} workers")
+        self.supervise()
+
+
+# ------------------- Memory Measurement -------------------
+def _measurement_payload(launcher: PreforkLauncher) -> dict:
+    """One valid /predict body, from the preloaded preprocessor or one loaded just for this."""
+    if launcher.module is not None:
+        preprocessor = launcher.module.preprocessor
+    else:
+        preprocessor = load_object(get_artifact_paths(None)[0])
+    row = make_synthetic_frame(preprocessor).iloc[0].to_dict()
+    return {k: v.item() if hasattr(v, "item") else v for k, v in row.items()}
+
+
+def _cpu_ticks(pid: int) -> int:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return int(fields[11]) + int(fields[12])   # utime + stime
+
+
+def _exercise(port: int, payload: dict, requests: int, concurrency: int):
+    """Sends requests from `concurrency` clients at once, each on its own connection, so every worker accepts some."""
+    body = json.dumps(payload).encode("utf-8")
+
+    def send(_):
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{port}/predict", data=body, headers={"Content-Type": "application/json"}
+        )
+        urllib.request.urlopen(request, timeout=30).read()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, range(requests)))
+
+
+def _wait_until_ready(port: int, timeout: float = 120.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=2).read()
+            return
+        except (urllib.error.HTTPError, OSError):
+            time.sleep(0.2)
+    raise TimeoutError(f"Server on port {port} was not ready in {timeout}s")
+
+
+def measure_scaling(config: LauncherConfig, max_workers: int, requests_per_step: int = 200, settle_seconds: float = 2.0):
+    """
+    Starts 1..max_workers workers in turn, drives /predict traffic at every
+    worker, with or without preload, and reports per-worker unique vs shared
+    memory and the total PSS per step.
+    """
+    report = []
+    launcher = PreforkLauncher(config)
+    if config.preload:
+        launcher.preload()
+    payload = _measurement_payload(launcher)
+
+    for n_workers in range(1, max_workers + 1):
+        launcher._stopping = False
+        launcher.start(n_workers)
+        try:
+            _wait_until_ready(config.port)
+            ticks_before = {pid: _cpu_ticks(pid) for pid in launcher.children}
+            _exercise(config.port, payload, requests_per_step * n_workers, concurrency=4 * n_workers)
+            exercised = sum(_cpu_ticks(pid) > ticks for pid, ticks in ticks_before.items())
+            if exercised < n_workers:
+                logging.warning(f"Only {exercised} of {n_workers} workers served measurement traffic")
+            time.sleep(settle_seconds)
+
+            workers = {pid: read_memory(pid) for pid in launcher.children}
+            parent = read_memory(os.getpid())
+            step = {
+                "workers": n_workers,
+                "exercised_workers": exercised,
+                "parent": parent,
+                "per_worker": workers,
+                "mean_unique_kb": sum(w["unique_kb"] for w in workers.values()) / n_workers,
+                "mean_shared_kb": sum(w["shared_kb"] for w in workers.values()) / n_workers,
+                "total_pss_kb": parent["pss_kb"] + sum(w["pss_kb"] for w in workers.values()),
+            }
+            report.append(step)
+            print(f"{n_workers:>3} workers | unique/worker {step['mean_unique_kb'] / 1024:8.1f} MB | "
+                  f"shared/worker {step['mean_shared_kb'] / 1024:8.1f} MB | "
+                  f"total PSS {step['total_pss_kb'] / 1024:8.1f} MB")
+        finally:
+            launcher.stop()
+            launcher.children = {}
+
+    launcher.sock.close()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prefork launcher for the prediction API")
+    parser.add_argument("--app", default=LauncherConfig.app)
+    parser.add_argument("--host", default=LauncherConfig.host)
+    parser.add_argument("--port", type=int, default=LauncherConfig.port)
+    parser.add_argument("--workers", type=int, default=LauncherConfig.workers)
+    parser.add_argument("--no-preload", action="store_true", help="import the app in each worker instead")
+    parser.add_argument("--no-freeze", action="store_true", help="skip gc.freeze() before forking")
+    parser.add_argument("--measure", type=int, metavar="N",
+                        help="report unique vs shared memory for 1..N workers and exit")
+    parser.add_argument("--report", help="write the measurement report to this JSON file")
+    args = parser.parse_args()
+
+    config = LauncherConfig(
+        app=args.app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        preload=not args.no_preload,
+        freeze=not args.no_freeze,
+    )
+
+    if args.measure:
+        results = measure_scaling(config, args.measure)
+        if args.report:
+            with open(args.report, "w") as f:
+                json.dump(results, f, indent=2)
+    else:
+        PreforkLauncher(config).run()
@@ -0,0 +1,184 @@
+"""Lazily loaded preprocessor/model pairs with least-recently-used eviction."""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+import numpy as np
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import load_object, get_artifact_version
+from src.pipelines.prediction_pipeline import get_artifact_paths, normalize_model_key, MODELS_DIR
+
+
+@dataclass
+class ModelRegistryConfig:
+    models_dir: str = MODELS_DIR
+    memory_budget_mb: float = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "1024"))
+    pin_default: bool = True   # the default pair is preloaded before fork, never evict it
+
+
+class UnknownModel(Exception):
+    pass
+
+
+class LoadedModel:
+    __slots__ = ("key", "preprocessor", "model", "version", "size_bytes", "load_seconds", "loaded_at")
+
+    def __init__(self, key, preprocessor, model, version, size_bytes, load_seconds):
+        self.key = key
+        self.preprocessor = preprocessor
+        self.model = model
+        self.version = version
+        self.size_bytes = size_bytes
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+
+
+class ModelRegistry:
+    """
+    Routes a model key (None = default artifacts) to its preprocessor/model
+    pair, unpickling it on first use. Resident pairs are kept in LRU order
+    and the least recently used ones are dropped once their combined size
+    exceeds the memory budget. Size is taken from the pickle files, a close
+    proxy for the resident size of a forest.
+    """
+
+    def __init__(self, config: ModelRegistryConfig = None):
+        self.config = config or ModelRegistryConfig()
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_latencies = deque(maxlen=256)
+
+    @property
+    def budget_bytes(self):
+        return int(self.config.memory_budget_mb * 1024 * 1024)
+
+    def resident_bytes(self):
+        return sum(entry.size_bytes for entry in self._models.values())
+
+    def available_keys(self):
+        if not os.path.isdir(self.config.models_dir):
+            return []
+        return sorted(
+            key for key in os.listdir(self.config.models_dir)
+            if os.path.isdir(os.path.join(self.config.models_dir, key))
+        )
+
+    def exists(self, key: str = None) -> bool:
+        """True when artifacts for the key are on disk, without loading them."""
+        key = normalize_model_key(key)
+        try:
+            preprocessor_path, model_path = get_artifact_paths(key)
+        except ValueError:
+            return False
+        return os.path.exists(preprocessor_path) and os.path.exists(model_path)
+
+    def _load(self, key):
+        try:
+            preprocessor_path, model_path = get_artifact_paths(key)
+        except ValueError as e:
+            raise UnknownModel(str(e))
+        if not (os.path.exists(preprocessor_path) and os.path.exists(model_path)):
+            raise UnknownModel(f"No artifacts for model key '{key}'")
+
+        try:
+            start = time.perf_counter()
+            preprocessor = load_object(preprocessor_path)
+            model = load_object(model_path)
+            load_seconds = time.perf_counter() - start
+            entry = LoadedModel(
+                key=key,
+                preprocessor=preprocessor,
+                model=model,
+                version=get_artifact_version(preprocessor_path, model_path),
+                size_bytes=os.path.getsize(preprocessor_path) + os.path.getsize(model_path),
+                load_seconds=load_seconds,
+            )
+            logging.info(f"Loaded model '{key or 'default'}' ({entry.size_bytes / 1e6:.1f} MB) in {load_seconds:.2f}s")
+            return entry
+        except Exception as e:
+            logging.error(f"Exception occurred while loading model '{key}'")
+            raise CustomException(e, sys)
+
+    def _evict(self, keep):
+        while self.resident_bytes() > self.budget_bytes:
+            victim = next(
+                (key for key in self._models
+                 if key != keep and not (self.config.pin_default and key is None)),
+                None
+            )
+            if victim is None:
+                break
+            entry = self._models.pop(victim)
+            self.evictions += 1
+            logging.info(f"Evicted model '{victim}' ({entry.size_bytes / 1e6:.1f} MB) to stay within budget")
+
+    def get(self, key: str = None) -> LoadedModel:
+        key = normalize_model_key(key)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        # Unknown keys fail before a load lock is created for them
+        if not self.exists(key):
+            raise UnknownModel(f"No artifacts for model key '{key}'")
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # One thread loads a given key while others wait for it; other keys load in parallel
+        with load_lock:
+            try:
+                with self._lock:
+                    entry = self._models.get(key)
+                    if entry is not None:
+                        self._models.move_to_end(key)
+                        self.hits += 1
+                        return entry
+                    self.misses += 1
+
+                entry = self._load(key)
+
+                with self._lock:
+                    self._models[key] = entry
+                    self.load_latencies.append(entry.load_seconds)
+                    self._evict(keep=key)
+                return entry
+            finally:
+                # Dropped on success and failure alike, so the dict only holds in-flight loads
+                with self._lock:
+                    if self._load_locks.get(key) is load_lock:
+                        del self._load_locks[key]
+
+    def metrics(self):
+        with self._lock:
+            latencies = np.array(self.load_latencies, dtype=float)
+            return {
+                "resident_models": [
+                    {
+                        "key": entry.key or "default",
+                        "version": entry.version,
+                        "size_mb": entry.size_bytes / 1e6,
+                        "load_seconds": entry.load_seconds,
+                        "loaded_at": entry.loaded_at,
+                    }
+                    for entry in self._models.values()
+                ],
+                "available_keys": self.available_keys(),
+                "resident_mb": self.resident_bytes() / 1e6,
+                "memory_budget_mb": self.config.memory_budget_mb,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "load_seconds_p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                "load_seconds_max": float(latencies.max()) if len(latencies) else None,
+            }
@@ -0,0 +1,156 @@
+"""Priority lanes that keep interactive predictions responsive under bulk load."""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict
+import numpy as np
+from src.logger import logging
+
+
+@dataclass
+class LaneConfig:
+    concurrency: int
+    priority: int             # lower value = more important
+    preemptible: bool = False # yields to busier higher-priority lanes between chunks
+
+
+@dataclass
+class SchedulerConfig:
+    lanes: Dict[str, LaneConfig] = field(default_factory=lambda: {
+        "interactive": LaneConfig(concurrency=int(os.getenv("INTERACTIVE_CONCURRENCY", "4")), priority=0),
+        "bulk": LaneConfig(concurrency=int(os.getenv("BULK_CONCURRENCY", "1")), priority=1, preemptible=True),
+    })
+    bulk_chunk_size: int = int(os.getenv("BULK_CHUNK_SIZE", "2000"))
+    max_yield_seconds: float = 0.05   # bound on how long a preemptible chunk waits, avoids starvation
+    latency_window: int = 2048        # recent requests kept per lane for percentiles
+
+
+class LaneMetrics:
+    """Rolling latency window and counters for one lane."""
+
+    def __init__(self, window: int):
+        self.latencies_ms = deque(maxlen=window)
+        self.queue_wait_ms = deque(maxlen=window)
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.queued = 0
+        self.yields = 0
+
+    def snapshot(self):
+        latencies = np.fromiter(self.latencies_ms, dtype=float)
+        waits = np.fromiter(self.queue_wait_ms, dtype=float)
+        percentiles = {}
+        if len(latencies):
+            for p in (50, 95, 99):
+                percentiles[f"p{p}_ms"] = float(np.percentile(latencies, p))
+            percentiles["queue_wait_p99_ms"] = float(np.percentile(waits, 99))
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "preemption_yields": self.yields,
+            **percentiles,
+        }
+
+
+class PriorityScheduler:
+    """
+    Runs prediction work on per-lane thread pools.
+
+    Every lane has its own workers, so interactive requests never queue
+    behind bulk scoring; lane concurrency caps how many threads each class
+    of work may occupy. Preemptible lanes process their work in chunks and,
+    at each chunk boundary, pause while a higher-priority lane has requests
+    in flight, which hands the interpreter to interactive work.
+    """
+
+    def __init__(self, config: SchedulerConfig = None):
+        self.config = config or SchedulerConfig()
+        self._lock = threading.Lock()
+        self._idle = {name: threading.Event() for name in self.config.lanes}
+        for event in self._idle.values():
+            event.set()
+        self.metrics = {name: LaneMetrics(self.config.latency_window) for name in self.config.lanes}
+        # Executors start their threads lazily, so constructing a scheduler before fork is safe
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=lane.concurrency, thread_name_prefix=f"lane-{name}")
+            for name, lane in self.config.lanes.items()
+        }
+        logging.info(f"Priority scheduler lanes: { {n: l.concurrency for n, l in self.config.lanes.items()} }")
+
+    def _run(self, lane, submitted_at, fn, args, kwargs):
+        metrics = self.metrics[lane]
+        started_at = time.perf_counter()
+        with self._lock:
+            metrics.queued -= 1
+            metrics.in_flight += 1
+            self._idle[lane].clear()
+        succeeded = False
+        try:
+            result = fn(*args, **kwargs)
+            succeeded = True
+            return result
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                if succeeded:
+                    metrics.completed += 1
+                else:
+                    metrics.failed += 1
+                metrics.in_flight -= 1
+                metrics.queue_wait_ms.append((started_at - submitted_at) * 1000)
+                metrics.latencies_ms.append((finished_at - submitted_at) * 1000)
+                if metrics.in_flight == 0:
+                    self._idle[lane].set()
+
+    def submit(self, lane: str, fn, *args, **kwargs):
+        """Queues fn on a lane and returns a concurrent.futures.Future."""
+        if lane not in self._executors:
+            raise ValueError(f"Unknown lane '{lane}', expected one of {list(self._executors)}")
+        with self._lock:
+            self.metrics[lane].queued += 1
+        return self._executors[lane].submit(self._run, lane, time.perf_counter(), fn, args, kwargs)
+
+    async def run(self, lane: str, fn, *args, **kwargs):
+        """Awaitable form of submit for async endpoints."""
+        return await asyncio.wrap_future(self.submit(lane, fn, *args, **kwargs))
+
+    def yield_to_higher_priority(self, lane: str) -> None:
+        """Blocks briefly while a more important lane has work in flight."""
+        lane_config = self.config.lanes[lane]
+        if not lane_config.preemptible:
+            return
+        for name, other in self.config.lanes.items():
+            if other.priority < lane_config.priority and not self._idle[name].is_set():
+                self.metrics[lane].yields += 1
+                self._idle[name].wait(self.config.max_yield_seconds)
+
+    def map_chunks(self, lane: str, fn, df, chunk_size: int = None):
+        """
+        Applies fn to consecutive row chunks of df from a thread already on
+        the lane, yielding to higher-priority lanes between chunks.
+        """
+        chunk_size = chunk_size or self.config.bulk_chunk_size
+        results = []
+        for start in range(0, len(df), chunk_size):
+            self.yield_to_higher_priority(lane)
+            results.append(fn(df.iloc[start:start + chunk_size]))
+        return np.concatenate(results) if results else np.array([])
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {"concurrency": self.config.lanes[name].concurrency, **metrics.snapshot()}
+                for name, metrics in self.metrics.items()
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
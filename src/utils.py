@@ -1,6 +1,9 @@
 import os
 import sys
+import json
+import time
 import pickle
+import hashlib
 import numpy as np
 import pandas as pd
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
@@ -100,4 +103,144 @@ def load_object(file_path):
                
      except Exception as e:
           logging.info("Exception occured in load_object funtion util")
-          raise CustomException(e, sys)
\ No newline at end of file
+          raise CustomException(e, sys)
+
+
+def save_json(file_path, obj):
+    try:
+        dir_path = os.path.dirname(file_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+        with open(file_path, "w") as file_obj:
+            json.dump(obj, file_obj, indent=2, default=str)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def load_json(file_path):
+    try:
+        with open(file_path) as file_obj:
+            return json.load(file_obj)
+
+    except Exception as e:
+        logging.info("Exception occured in load_json function util")
+        raise CustomException(e, sys)
+
+
+def evaluate_model_latency(models, X, n_single_rows=200, batch_size=1000, preprocessor=None):
+    """
+    Measures the serving cost of already fitted models.
+
+    Args:
+        models: dict of fitted models {"model_name": model_instance}
+        X: raw request rows (DataFrame) when preprocessor is given, else
+            feature rows in the shape the models are fitted on
+        n_single_rows: number of one-row predict calls to time
+        batch_size: rows per batch predict call
+        preprocessor: fitted preprocessor; when given, every timed call runs
+            preprocessor.transform + model.predict, as a served request does
+
+    Returns:
+        dict of model_name -> {single_row_p50_ms, single_row_p99_ms,
+        batch_ms_per_1k_rows, artifact_size_kb}
+    """
+    try:
+        if preprocessor is not None:
+            X = X.reset_index(drop=True)
+            batch = X.iloc[np.resize(np.arange(len(X)), batch_size)]
+            rows = lambda start, stop: X.iloc[start:stop]
+        else:
+            X = np.asarray(X)
+            batch = np.resize(X, (batch_size, X.shape[1]))
+            rows = lambda start, stop: X[start:stop]
+        n_single_rows = min(n_single_rows, len(X))
+        report = {}
+
+        for model_name, model in models.items():
+            if preprocessor is not None:
+                predict = lambda features: model.predict(preprocessor.transform(features))
+            else:
+                predict = model.predict
+
+            # Warm-up call so lazy imports and allocations are not timed
+            predict(rows(0, 1))
+
+            single_row_ms = []
+            for i in range(n_single_rows):
+                single_row = rows(i, i + 1)
+                start = time.perf_counter()
+                predict(single_row)
+                single_row_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            predict(batch)
+            batch_ms = (time.perf_counter() - start) * 1000
+
+            report[model_name] = {
+                "single_row_p50_ms": float(np.percentile(single_row_ms, 50)),
+                "single_row_p99_ms": float(np.percentile(single_row_ms, 99)),
+                "batch_ms_per_1k_rows": batch_ms * 1000 / batch_size,
+                "artifact_size_kb": len(pickle.dumps(model)) / 1024,
+            }
+            logging.info(f"Serving cost for {model_name}: {report[model_name]}")
+
+        return report
+
+    except Exception as e:
+        logging.info("Exception occurred during model latency evaluation")
+        raise CustomException(e, sys)
+
+
+def select_pareto_model(metrics, latency_budget_ms, score_key="f1_macro", latency_key="single_row_p99_ms"):
+    """
+    Picks a model on the score/latency Pareto front.
+
+    A model is on the front when no other model is both at least as accurate
+    and at least as fast (and strictly better on one of the two). The most
+    accurate front member within the latency budget wins; if none fits the
+    budget the fastest model is returned.
+
+    Args:
+        metrics: dict of model_name -> dict holding score_key and latency_key
+        latency_budget_ms: serving latency budget compared against latency_key
+        score_key: higher-is-better metric
+        latency_key: lower-is-better metric
+
+    Returns:
+        (selected model_name, list of model names on the Pareto front)
+    """
+    front = []
+    for name, m in metrics.items():
+        dominated = any(
+            other[score_key] >= m[score_key] and other[latency_key] <= m[latency_key]
+            and (other[score_key] > m[score_key] or other[latency_key] < m[latency_key])
+            for other_name, other in metrics.items() if other_name != name
+        )
+        if not dominated:
+            front.append(name)
+
+    within_budget = [name for name in front if metrics[name][latency_key] <= latency_budget_ms]
+    if within_budget:
+        selected = max(within_budget, key=lambda name: (metrics[name][score_key], -metrics[name][latency_key]))
+    else:
+        selected = min(metrics, key=lambda name: metrics[name][latency_key])
+        logging.warning(f"No model meets the {latency_budget_ms}ms latency budget, falling back to the fastest: {selected}")
+
+    return selected, front
+
+
+def get_artifact_version(*file_paths):
+    """Short content hash identifying a set of artifact files (e.g. preprocessor + model)."""
+    try:
+        digest = hashlib.sha256()
+        for file_path in file_paths:
+            with open(file_path, "rb") as file_obj:
+                for block in iter(lambda: file_obj.read(1 << 20), b""):
+                    digest.update(block)
+        return digest.hexdigest()[:12]
+
+    except Exception as e:
+        logging.info("Exception occured in get_artifact_version function util")
+        raise CustomException(e, sys)
@@ -61,3 +61,148 @@ function drawChart(predValue){
         }
     });
 }
+
+
+// ---------------- CSV Upload ------------------
+
+// The file is read one slice at a time and each slice is scored before the next is read,
+// so neither the browser nor the server ever holds the whole file.
+const CSV_CHUNK_BYTES = 512 * 1024;
+const MAX_RESULT_ROWS = 500;
+
+let labelCounts = {};
+
+async function uploadCsv(){
+
+    const file = document.getElementById("csvFile").files[0];
+    if(!file){
+        return;
+    }
+
+    const button = document.getElementById("csvUploadButton");
+    const progress = document.getElementById("csvProgress");
+    const status = document.getElementById("csvStatus");
+
+    button.disabled = true;
+    labelCounts = {};
+    document.querySelector("#csvResults tbody").innerHTML = "";
+    document.getElementById("csvSummary").innerHTML = "";
+    progress.value = 0;
+
+    const decoder = new TextDecoder();
+    let header = null;
+    let carry = "";
+    let position = 0;
+    let rowsDone = 0;
+
+    try {
+        while(position < file.size){
+            const buffer = await file.slice(position, position + CSV_CHUNK_BYTES).arrayBuffer();
+            position += CSV_CHUNK_BYTES;
+            const last = position >= file.size;
+
+            let text = carry + decoder.decode(buffer, {stream: !last});
+            if(header === null){
+                const newline = text.indexOf("\n");
+                if(newline < 0 && !last){
+                    carry = text;
+                    continue;
+                }
+                header = text.slice(0, newline + 1) || text + "\n";
+                text = newline < 0 ? "" : text.slice(newline + 1);
+            }
+
+            // Send whole lines only; the partial last line waits for the next slice
+            const cut = last ? text.length : text.lastIndexOf("\n") + 1;
+            carry = text.slice(cut);
+            const rows = text.slice(0, cut);
+
+            if(rows.trim()){
+                rowsDone += await sendCsvChunk(header + rows, rowsDone);
+            }
+
+            progress.value = Math.min(position / file.size, 1);
+            status.innerHTML = `${rowsDone} rows scored`;
+        }
+        status.innerHTML = `Done: ${rowsDone} rows scored`;
+    } catch(err) {
+        status.innerHTML = `Upload stopped after ${rowsDone} rows: ${err.message}`;
+    } finally {
+        button.disabled = false;
+    }
+}
+
+async function sendCsvChunk(csvText, offset){
+
+    const res = await fetch(`/predict_csv?offset=${offset}`, {
+        method:"POST",
+        headers:{ "Content-Type":"text/csv"},
+        body:csvText
+    });
+
+    if(!res.ok){
+        const err = await res.json();
+        throw new Error(err.detail);
+    }
+
+    // NDJSON: one line per scored block, then a final {"done": true, "rows": n}
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = "";
+    let rows = 0;
+
+    while(true){
+        const {done, value} = await reader.read();
+        if(done){
+            break;
+        }
+        buffered += decoder.decode(value, {stream:true});
+
+        let newline;
+        while((newline = buffered.indexOf("\n")) >= 0){
+            const line = buffered.slice(0, newline);
+            buffered = buffered.slice(newline + 1);
+            if(!line){
+                continue;
+            }
+            const message = JSON.parse(line);
+            if(message.error){
+                throw new Error(message.error);
+            }
+            if(message.done){
+                rows = message.rows;
+            } else {
+                showCsvResults(message);
+            }
+        }
+    }
+    return rows;
+}
+
+function showCsvResults(message){
+
+    const tbody = document.querySelector("#csvResults tbody");
+    const fragment = document.createDocumentFragment();
+
+    message.predictions.forEach((prediction, i) => {
+        labelCounts[prediction] = (labelCounts[prediction] || 0) + 1;
+
+        const row = document.createElement("tr");
+        [message.offset + i + 1, message.ids ? message.ids[i] : "", prediction].forEach(value => {
+            const cell = document.createElement("td");
+            cell.textContent = value;
+            row.appendChild(cell);
+        });
+        fragment.appendChild(row);
+    });
+    tbody.appendChild(fragment);
+
+    // Keep only the latest rows on the page
+    while(tbody.rows.length > MAX_RESULT_ROWS){
+        tbody.deleteRow(0);
+    }
+
+    document.getElementById("csvSummary").innerHTML = Object.entries(labelCounts)
+        .map(([label, count]) => `<span class="label-count">${label}: ${count}</span>`)
+        .join("");
+}
@@ -0,0 +1,41 @@
+import math
+import random
+from src.monitoring.input_drift import CountMinSketch
+
+
+def _synthetic_counts(n_keys=1000, seed=0):
+    rng = random.Random(seed)
+    return {f"City_{i:03d}": rng.randint(1, 50) for i in range(n_keys)}
+
+
+def test_count_min_estimates_stay_within_error_bound():
+    counts = _synthetic_counts()
+    sketch = CountMinSketch(width=1024, depth=4)
+    for key, count in counts.items():
+        sketch.add(key, count)
+
+    errors = [sketch.estimate(key) - count for key, count in counts.items()]
+    bound = math.e * sketch.total / sketch.width
+
+    assert min(errors) >= 0
+    assert max(errors) <= bound
+    # Independent rows keep the mean overestimate far below the per-key bound
+    assert sum(errors) / len(errors) < 0.1 * bound
+
+
+def test_count_min_rows_collide_independently():
+    sketch = CountMinSketch(width=1024, depth=4)
+    indexes = {key: sketch._indexes(key) for key in _synthetic_counts()}
+    by_first_row = {}
+    for key, idx in indexes.items():
+        by_first_row.setdefault(idx[0], []).append(idx)
+
+    row0_pairs = all_rows_pairs = 0
+    for group in by_first_row.values():
+        for i in range(len(group)):
+            for j in range(i + 1, len(group)):
+                row0_pairs += 1
+                all_rows_pairs += group[i] == group[j]
+
+    assert row0_pairs > 0
+    assert all_rows_pairs == 0
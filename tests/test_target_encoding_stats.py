@@ -0,0 +1,31 @@
+import copy
+import numpy as np
+from sklearn.model_selection import train_test_split
+from benchmarks.synthetic import make_cohort
+from src.components.data_transformation import (
+    DataTransformation, TargetEncodingStats, CAT_TARGET_ENC_COLS, TARGET_COLUMN
+)
+
+
+def test_apply_to_reproduces_fitted_target_encoder_mapping():
+    # apply_to re-implements category_encoders internals; this catches library changes
+    cohort = make_cohort(3000, seed=7, with_target=True)
+    train_df, _ = train_test_split(cohort, test_size=0.2, random_state=42)
+    X_train = train_df.drop(columns=[TARGET_COLUMN])
+    y_train = train_df[TARGET_COLUMN]
+
+    preprocessor = DataTransformation().get_data_transformation_object()
+    preprocessor.fit(X_train, y_train)
+    pipeline = preprocessor.named_transformers_["target_enc"]
+    fitted_encoder = pipeline.named_steps["target_enc"]
+
+    stats = TargetEncodingStats(CAT_TARGET_ENC_COLS).update(
+        pipeline.named_steps["imputer"].transform(X_train[CAT_TARGET_ENC_COLS]), y_train
+    )
+    rebuilt_encoder = stats.apply_to(copy.deepcopy(fitted_encoder))
+
+    assert rebuilt_encoder._mean == fitted_encoder._mean
+    for col, expected in fitted_encoder.mapping.items():
+        actual = rebuilt_encoder.mapping[col]
+        assert sorted(actual.index) == sorted(expected.index)
+        np.testing.assert_allclose(actual.loc[expected.index].to_numpy(), expected.to_numpy(), rtol=0, atol=1e-12)